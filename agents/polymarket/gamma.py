@@ -1,9 +1,23 @@
 import httpx
 import json
+import orjson
 
 from agents.polymarket.polymarket import Polymarket
 from agents.utils.objects import Market, PolymarketEvent, ClobReward, Tag
 
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_SUPPORT = True
+except ImportError:
+    HTTP2_SUPPORT = False
+
+# Shared keep-alive client for every Gamma request; multiplexes over one
+# HTTP/2 connection when h2 is installed
+_http = httpx.Client(
+    http2=HTTP2_SUPPORT,
+    limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+)
+
 
 class GammaMarketClient:
     def __init__(self):
@@ -37,11 +51,11 @@ class GammaMarketClient:
 
             # These two fields below are returned as stringified lists from the api
             if "outcomePrices" in market_object:
-                market_object["outcomePrices"] = json.loads(
+                market_object["outcomePrices"] = orjson.loads(
                     market_object["outcomePrices"]
                 )
             if "clobTokenIds" in market_object:
-                market_object["clobTokenIds"] = json.loads(
+                market_object["clobTokenIds"] = orjson.loads(
                     market_object["clobTokenIds"]
                 )
 
@@ -86,9 +100,9 @@ class GammaMarketClient:
                 'Cannot use "parse_pydantic" and "local_file" params simultaneously.'
             )
 
-        response = httpx.get(self.gamma_markets_endpoint, params=querystring_params)
+        response = _http.get(self.gamma_markets_endpoint, params=querystring_params)
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             if local_file_path is not None:
                 with open(local_file_path, "w+") as out_file:
                     json.dump(data, out_file)
@@ -111,9 +125,9 @@ class GammaMarketClient:
                 'Cannot use "parse_pydantic" and "local_file" params simultaneously.'
             )
 
-        response = httpx.get(self.gamma_events_endpoint, params=querystring_params)
+        response = _http.get(self.gamma_events_endpoint, params=querystring_params)
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             if local_file_path is not None:
                 with open(local_file_path, "w+") as out_file:
                     json.dump(data, out_file)
@@ -187,8 +201,8 @@ class GammaMarketClient:
     def get_market(self, market_id: int) -> dict():
         url = self.gamma_markets_endpoint + "/" + str(market_id)
         print(url)
-        response = httpx.get(url)
-        return response.json()
+        response = _http.get(url)
+        return orjson.loads(response.content)
 
 
 if __name__ == "__main__":
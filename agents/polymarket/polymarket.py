@@ -18,6 +18,7 @@ except ImportError:
     from web3.middleware import geth_poa_middleware as ExtraDataToPOAMiddleware
 
 import httpx
+import orjson
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import ApiCreds
 from py_clob_client.constants import AMOY, POLYGON
@@ -29,6 +30,7 @@ from py_clob_client.clob_types import (
     MarketOrderArgs,
     OrderType,
     OrderBookSummary,
+    BookParams,
 )
 from py_clob_client.order_builder.constants import BUY
 
@@ -36,6 +38,9 @@ from agents.utils.objects import SimpleMarket, SimpleEvent
 
 load_dotenv()
 
+# Token ids per POST /books request; larger scans are split into chunks
+ORDER_BOOK_BATCH_SIZE = 500
+
 
 class Polymarket:
     def __init__(self) -> None:
@@ -209,7 +214,7 @@ class Polymarket:
         }
         res = httpx.get(self.gamma_markets_endpoint, params=params)
         if res.status_code == 200:
-            for market in res.json():
+            for market in orjson.loads(res.content):
                 try:
                     market_data = self.map_api_to_market(market)
                     markets.append(SimpleMarket(**market_data))
@@ -229,7 +234,7 @@ class Polymarket:
         params = {"clob_token_ids": token_id}
         res = httpx.get(self.gamma_markets_endpoint, params=params)
         if res.status_code == 200:
-            data = res.json()
+            data = orjson.loads(res.content)
             market = data[0]
             return self.map_api_to_market(market, token_id)
 
@@ -258,8 +263,9 @@ class Polymarket:
         events = []
         res = httpx.get(self.gamma_events_endpoint)
         if res.status_code == 200:
-            print(len(res.json()))
-            for event in res.json():
+            events_data = orjson.loads(res.content)
+            print(len(events_data))
+            for event in events_data:
                 try:
                     print(1)
                     event_data = self.map_api_to_event(event)
@@ -358,6 +364,20 @@ class Polymarket:
     def get_orderbook(self, token_id: str) -> OrderBookSummary:
         return self.client.get_order_book(token_id)
 
+    def get_orderbooks(self, token_ids: "list[str]") -> "dict[str, OrderBookSummary]":
+        """Fetch many order books in one request per chunk, keyed by token id.
+
+        Results are matched back by ``asset_id`` rather than position, since
+        the batch endpoint does not promise to preserve request order.
+        """
+        books = {}
+        for start in range(0, len(token_ids), ORDER_BOOK_BATCH_SIZE):
+            chunk = token_ids[start:start + ORDER_BOOK_BATCH_SIZE]
+            params = [BookParams(token_id=token_id) for token_id in chunk]
+            for book in self.client.get_order_books(params):
+                books[book.asset_id] = book
+        return books
+
     def get_orderbook_price(self, token_id: str) -> float:
         return float(self.client.get_price(token_id))
 
@@ -486,7 +506,7 @@ class Polymarket:
             res = httpx.get(self.gamma_markets_endpoint, params=params)
             
             if res.status_code == 200:
-                markets = res.json()
+                markets = orjson.loads(res.content)
                 for market in markets[:50]:  # Check first 50 markets
                     try:
                         token_ids = ast.literal_eval(market.get('clobTokenIds', '[]'))
@@ -550,7 +570,7 @@ def gamma():
     code = res.status_code
     if code == 200:
         markets: list[SimpleMarket] = []
-        data = res.json()
+        data = orjson.loads(res.content)
         for market in data:
             try:
                 market_data = {
@@ -5,7 +5,7 @@ Supports pagination, binary-only filtering, and fallback data.
 """
 import requests
 import logging
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime, timezone
 from pydantic import BaseModel, Field, validator
 import time
@@ -17,6 +17,11 @@ logger = logging.getLogger(__name__)
 POLYMARKET_API_BASE = "https://gamma-api.polymarket.com"
 CLOB_API_BASE = "https://clob.polymarket.com"
 
+# Process-wide cache of get_all_active_markets results, so repeated analyses
+# in one session (e.g. several modes) skip re-paginating the API
+MARKETS_CACHE_TTL = 60  # seconds
+_markets_cache: Dict[tuple, tuple] = {}  # key -> (expires_at, markets, skipped_markets)
+
 # Fallback sample markets for testing when API fails
 FALLBACK_MARKETS = [
     {
@@ -103,6 +108,18 @@ class Market(BaseModel):
     def no_price(self) -> float:
         return self.outcome_prices[1] if len(self.outcome_prices) > 1 else 0
     
+    @property
+    def price_bounds(self) -> Tuple[float, float]:
+        """(min, max) outcome price in a single pass over outcome_prices"""
+        prices = self.outcome_prices
+        min_price = max_price = prices[0]
+        for p in prices[1:]:
+            if p > max_price:
+                max_price = p
+            elif p < min_price:
+                min_price = p
+        return min_price, max_price
+    
     @property
     def days_to_resolution(self) -> Optional[int]:
         """Calculate days to resolution accurately using UTC"""
@@ -206,17 +223,46 @@ class PolymarketAPIClient:
         logger.info(f"Fetched {len(markets)} valid markets (skipped {len(self.skipped_markets)} invalid)")
         return markets
     
-    def get_all_active_markets(self, max_markets: int = 500, sort_by_volume: bool = True) -> List[Market]:
+    def get_all_active_markets(
+        self,
+        max_markets: int = 500,
+        sort_by_volume: bool = True,
+        use_cache: bool = True
+    ) -> List[Market]:
         """
         Fetch all active markets with pagination.
         
         Args:
             max_markets: Maximum number of markets to fetch (default 500)
             sort_by_volume: If True, sort by 24h volume descending
+            use_cache: Reuse a result fetched within MARKETS_CACHE_TTL seconds
             
         Returns:
             List of validated Market objects
         """
+        cache_key = (max_markets, sort_by_volume, self.binary_only)
+        if use_cache:
+            cached = _markets_cache.get(cache_key)
+            if cached and cached[0] > time.time():
+                _, markets, skipped = cached
+                self.skipped_markets.extend(skipped)
+                logger.info(f"Using {len(markets)} cached markets")
+                return list(markets)
+        
+        skipped_before = len(self.skipped_markets)
+        # Reflects this fetch only, so a recovered API is cached again
+        self.use_fallback = False
+        markets = self._fetch_all_active_markets(max_markets, sort_by_volume)
+        if not self.use_fallback:
+            _markets_cache[cache_key] = (
+                time.time() + MARKETS_CACHE_TTL,
+                list(markets),
+                self.skipped_markets[skipped_before:]
+            )
+        return markets
+    
+    def _fetch_all_active_markets(self, max_markets: int, sort_by_volume: bool) -> List[Market]:
+        """Paginate through the markets API (see get_all_active_markets)"""
         all_markets = []
         offset = 0
         page_size = 100  # API typically allows 100 per page
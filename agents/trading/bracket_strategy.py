@@ -10,6 +10,8 @@ from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
 
+from markupsafe import escape
+
 from agents.trading.api_client import Market
 
 logger = logging.getLogger(__name__)
@@ -397,14 +399,15 @@ Confidence: {strategy.confidence} | {strategy.resolution_info}
         return output
     
     def format_strategy_html(self, strategy: BracketStrategy) -> str:
-        """Format a bracket strategy as HTML"""
+        """Format a bracket strategy as HTML (market-derived text is escaped)"""
         trades_html = ""
         for trade in strategy.recommended_trades:
             bracket = trade['bracket']
             action = trade['action'].replace('_', ' ')
             price = trade['price']
             edge = trade['edge']
-            market = bracket.market
+            label = escape(bracket.bracket_label)
+            url = escape(bracket.market.market_url)
             
             if trade['action'] == 'BUY_NO':
                 action_text = f"<strong>{action}</strong> @ ~{int(bracket.yes_price*100)}¢ (Yes price)"
@@ -415,29 +418,28 @@ Confidence: {strategy.confidence} | {strategy.resolution_info}
             
             trades_html += f"""
             <div class="bracket-trade">
-                <div class="bracket-label">{bracket.bracket_label}</div>
+                <div class="bracket-label">{label}</div>
                 <div class="bracket-action">{action_text}</div>
                 <div class="bracket-edge">{edge_text}</div>
-                <a href="{market.market_url}" target="_blank" class="trade-link">Trade →</a>
+                <a href="{url}" target="_blank" class="trade-link">Trade →</a>
             </div>
             """
         
         links_html = ""
         for trade in strategy.recommended_trades:
             bracket = trade['bracket']
-            market = bracket.market
             action_note = " (Buy No)" if trade['action'] == 'BUY_NO' else ""
-            links_html += f'<li><a href="{market.market_url}" target="_blank">{bracket.bracket_label}{action_note}</a></li>'
+            links_html += f'<li><a href="{escape(bracket.market.market_url)}" target="_blank">{escape(bracket.bracket_label)}{action_note}</a></li>'
         
         return f"""
         <div class="bracket-strategy">
             <div class="bracket-header">
                 <h3>📊 COMBINED BRACKET STRATEGY</h3>
-                <div class="bracket-topic">{strategy.topic}</div>
+                <div class="bracket-topic">{escape(strategy.topic)}</div>
             </div>
             
             <div class="bracket-thesis">
-                <strong>Thesis:</strong> {strategy.thesis}
+                <strong>Thesis:</strong> {escape(strategy.thesis)}
             </div>
             
             <div class="bracket-trades">
@@ -470,7 +472,7 @@ Confidence: {strategy.confidence} | {strategy.resolution_info}
             </div>
             
             <div class="bracket-footer">
-                {strategy.resolution_info}
+                {escape(strategy.resolution_info)}
             </div>
         </div>
         """
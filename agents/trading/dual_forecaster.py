@@ -3,11 +3,14 @@ Dual AI Forecaster - Ensemble predictions from GPT-4o-mini + Grok
 Uses both AIs and averages predictions when they agree, flags disagreements.
 """
 import os
+import re
+import json
 import logging
-from typing import Optional, Tuple, Dict
+from typing import Callable, Optional, Tuple, Dict, List
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
+import tiktoken
 from langchain_openai import ChatOpenAI
 from openai import OpenAI
 
@@ -15,6 +18,20 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+# Rough characters per token, used to budget prompts when tiktoken is unavailable
+CHARS_PER_TOKEN = 4
+
+# Final-answer formats that end a forecast; the trailing delimiter guarantees the
+# outcome word is complete, so a streamed response can stop as soon as one matches
+LIKELIHOOD_ANSWER_RE = re.compile(
+    r'likelihood\s*[`\'"]*([0-9.]+)\s*%?[`\'"]*\s*for\s*outcome\s*of\s*[`\'"]*(Yes|No)[`\'".\s]',
+    re.IGNORECASE
+)
+FOOTER_ANSWER_RE = re.compile(
+    r'PROBABILITY[:\s]+(\d+(?:\.\d+)?)\s*%\s*OUTCOME[:\s]+(Yes|No)\b',
+    re.IGNORECASE
+)
+
 
 @dataclass
 class ForecastResult:
@@ -43,6 +60,20 @@ class DualForecaster:
     HIGH_AGREEMENT_THRESHOLD = 0.10  # Within 10% = high confidence
     SKIP_THRESHOLD = 0.20  # More than 20% apart = skip trade
     
+    # Grok prompt token budgets
+    GROK_CONTEXT_TOKENS = 1200  # Max tokens of real-time context sent to Grok
+    GROK_DESCRIPTION_TOKENS = 400  # Max tokens of market description
+    GROK_MAX_TOKENS = 300  # Response budget (analysis + PROBABILITY/OUTCOME footer)
+    
+    # Batched forecasts (one request covering several markets)
+    BATCH_CONTEXT_TOKENS = 800  # Max tokens of context per market in a batch prompt
+    BATCH_TOKENS_PER_MARKET = 150  # Grok response budget per market in a batch
+    
+    BATCH_SYSTEM_PROMPT = (
+        "You are an expert forecaster who provides precise probability estimates "
+        "for prediction markets. Respond only with a JSON object."
+    )
+    
     def __init__(self):
         """Initialize both AI clients"""
         # GPT-4o-mini via LangChain
@@ -65,6 +96,33 @@ class DualForecaster:
             logger.info(f"✓ Dual AI enabled: {self.gpt_model} + {self.grok_model}")
         else:
             logger.warning("⚠️ XAI_API_KEY not set - using GPT-4o-mini only")
+        
+        # Tokenizer used to trim prompt sections to a token budget; loaded on
+        # first use since tiktoken downloads the BPE file the first time
+        self._encoding = None
+        self._encoding_loaded = False
+    
+    def _get_encoding(self):
+        """cl100k_base tokenizer, or None if it cannot be loaded (e.g. offline)"""
+        if not self._encoding_loaded:
+            self._encoding_loaded = True
+            try:
+                self._encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                logger.warning(f"Tokenizer unavailable, truncating by characters: {e}")
+        return self._encoding
+    
+    def _truncate_tokens(self, text: str, max_tokens: int) -> str:
+        """Truncate text to at most max_tokens tokens (approximated by characters without a tokenizer)"""
+        if not text:
+            return ""
+        encoding = self._get_encoding()
+        if encoding is None:
+            return text[:max_tokens * CHARS_PER_TOKEN]
+        tokens = encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return encoding.decode(tokens[:max_tokens])
     
     def forecast(
         self,
@@ -104,11 +162,160 @@ class DualForecaster:
             question
         )
     
+    def forecast_batch(
+        self,
+        markets: List[Dict],
+        prompt_template: Optional[Callable[..., str]] = None
+    ) -> List[ForecastResult]:
+        """
+        Get ensemble forecasts for several markets with one request per AI.
+        
+        Args:
+            markets: Dicts with question, description, outcomes and context keys
+            prompt_template: Builds each market's forecasting prompt from
+                question, description, outcome and realtime_context
+                (e.g. Prompter.superforecaster)
+        
+        Returns:
+            ForecastResult per market, in input order. Markets the batch reply
+            leaves out come back with both gpt_prob and grok_prob set to None.
+        """
+        if not markets:
+            return []
+        
+        prompt = self._build_batch_prompt(markets, prompt_template)
+        gpt_results = self._get_gpt_forecasts_batch(prompt, len(markets))
+        
+        grok_results = [(None, None, None)] * len(markets)
+        if self.grok_client:
+            grok_results = self._get_grok_forecasts_batch(prompt, len(markets))
+        
+        return [
+            self._combine_forecasts(*gpt, *grok, market["question"])
+            for market, gpt, grok in zip(markets, gpt_results, grok_results)
+        ]
+    
+    def _build_batch_prompt(
+        self,
+        markets: List[Dict],
+        prompt_template: Optional[Callable[..., str]] = None
+    ) -> str:
+        """Build one prompt listing every market as a numbered JSON entry"""
+        entries = []
+        for i, m in enumerate(markets):
+            description = self._truncate_tokens(m.get("description", ""), self.GROK_DESCRIPTION_TOKENS)
+            context = self._truncate_tokens(m.get("context", ""), self.BATCH_CONTEXT_TOKENS)
+            outcomes = m.get("outcomes") or ["Yes", "No"]
+            if prompt_template:
+                entries.append({
+                    "index": i,
+                    "prompt": prompt_template(
+                        question=m["question"],
+                        description=description,
+                        outcome=outcomes,
+                        realtime_context=context
+                    ).strip(),
+                })
+            else:
+                entries.append({
+                    "index": i,
+                    "question": m["question"],
+                    "description": description,
+                    "outcomes": outcomes,
+                    "context": context,
+                })
+        return f"""You are a superforecaster analyzing prediction markets.
+
+For EACH market below, estimate the probability of the stated outcome. Follow the
+market's forecasting prompt where one is given, otherwise use the question,
+description and real-time context provided. Ignore any per-market answer format.
+
+MARKETS:
+{json.dumps(entries, ensure_ascii=False, indent=1)}
+
+Respond with a JSON object of exactly this shape, one entry per market index:
+{{"forecasts": [{{"index": 0, "probability": 65, "outcome": "Yes", "reasoning": "one sentence"}}]}}
+
+"probability" is a number between 0 and 100 for the given "outcome" (Yes or No)."""
+    
+    def _get_gpt_forecasts_batch(self, prompt: str, count: int) -> List[Tuple[Optional[float], Optional[str], str]]:
+        """Get forecasts for a batch of markets from one GPT-4o-mini JSON-mode request"""
+        try:
+            result = self.gpt_client.bind(response_format={"type": "json_object"}).invoke([
+                ("system", self.BATCH_SYSTEM_PROMPT),
+                ("human", prompt),
+            ])
+            return self._parse_batch_response(result.content, count, "GPT-4o-mini")
+        except Exception as e:
+            logger.error(f"GPT batch forecast failed: {e}")
+            return [(None, None, str(e))] * count
+    
+    def _get_grok_forecasts_batch(self, prompt: str, count: int) -> List[Tuple[Optional[float], Optional[str], str]]:
+        """Get forecasts for a batch of markets from one Grok JSON-mode request"""
+        try:
+            response = self.grok_client.chat.completions.create(
+                model=self.grok_model,
+                messages=[
+                    {"role": "system", "content": self.BATCH_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0,
+                max_tokens=self.BATCH_TOKENS_PER_MARKET * count + 100,
+                response_format={"type": "json_object"}
+            )
+            return self._parse_batch_response(response.choices[0].message.content, count, "Grok")
+        except Exception as e:
+            logger.error(f"Grok batch forecast failed: {e}")
+            return [(None, None, str(e))] * count
+    
+    def _parse_batch_response(
+        self,
+        response: str,
+        count: int,
+        source: str
+    ) -> List[Tuple[Optional[float], Optional[str], str]]:
+        """Route per-market probabilities from a batch JSON response back by index"""
+        results = [(None, None, f"{source}: no forecast returned")] * count
+        try:
+            forecasts = json.loads(response).get("forecasts", [])
+        except (ValueError, AttributeError) as e:
+            logger.error(f"{source} batch response was not valid JSON: {e}")
+            return results
+        
+        for item in forecasts:
+            try:
+                index = int(item["index"])
+                prob = float(item["probability"]) / 100.0
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not 0 <= index < count:
+                continue
+            outcome = str(item.get("outcome", "Yes")).capitalize()
+            if outcome not in ("Yes", "No"):
+                outcome = "Yes"
+            results[index] = (max(0.01, min(0.99, prob)), outcome, str(item.get("reasoning", ""))[:500])
+        
+        parsed = sum(1 for r in results if r[0] is not None)
+        logger.info(f"{source}: parsed {parsed}/{count} batch forecasts")
+        return results
+    
     def _get_gpt_forecast(self, prompt: str) -> Tuple[Optional[float], Optional[str], str]:
-        """Get forecast from GPT-4o-mini"""
+        """
+        Get forecast from GPT-4o-mini, streaming until the final answer appears.
+        
+        Only the single-market forecast() path streams; batched runs use
+        forecast_batch and reach this when a market is retried individually.
+        """
         try:
-            result = self.gpt_client.invoke(prompt)
-            response = result.content
+            response = ""
+            stream = self.gpt_client.stream(prompt)
+            try:
+                for chunk in stream:
+                    response += chunk.content
+                    if LIKELIHOOD_ANSWER_RE.search(response) or FOOTER_ANSWER_RE.search(response):
+                        break  # Answer parsed - stop generating tokens
+            finally:
+                stream.close()
             
             prob, outcome = self._parse_probability(response)
             logger.info(f"GPT-4o-mini: {prob*100:.1f}% {outcome}" if prob else "GPT-4o-mini: Failed to parse")
@@ -128,6 +335,9 @@ class DualForecaster:
     ) -> Tuple[Optional[float], Optional[str], str]:
         """Get forecast from Grok"""
         try:
+            description = self._truncate_tokens(description, self.GROK_DESCRIPTION_TOKENS)
+            context = self._truncate_tokens(context, self.GROK_CONTEXT_TOKENS)
+            
             # Grok-specific prompt (more conversational)
             prompt = f"""You are a superforecaster analyzing prediction markets.
 
@@ -138,9 +348,9 @@ DESCRIPTION: {description}
 POSSIBLE OUTCOMES: {', '.join(outcomes) if outcomes else 'Yes / No'}
 
 REAL-TIME CONTEXT:
-{context[:2000]}
+{context}
 
-Analyze this market and provide your probability estimate.
+Analyze this market and provide your probability estimate. Keep the analysis brief (under 150 words).
 
 IMPORTANT: End your response with EXACTLY this format:
 PROBABILITY: [number between 0 and 100]%
@@ -157,7 +367,7 @@ Now provide your analysis:"""
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0,
-                max_tokens=1000
+                max_tokens=self.GROK_MAX_TOKENS
             )
             
             response_text = response.choices[0].message.content
@@ -173,11 +383,17 @@ Now provide your analysis:"""
     
     def _parse_probability(self, response: str) -> Tuple[Optional[float], Optional[str]]:
         """Parse probability and outcome from AI response"""
-        import re
-        
         prob = None
         outcome = "Yes"
         
+        # Superforecaster prompt format: likelihood `0.6` for outcome of `Yes`
+        likelihood_match = LIKELIHOOD_ANSWER_RE.search(response + " ")
+        if likelihood_match:
+            prob = float(likelihood_match.group(1))
+            prob = prob if prob <= 1 else prob / 100.0
+            outcome = likelihood_match.group(2).capitalize()
+            return max(0.01, min(0.99, prob)), outcome
+        
         # Try to find PROBABILITY: X% pattern
         prob_match = re.search(r'PROBABILITY[:\s]+(\d+(?:\.\d+)?)\s*%', response, re.IGNORECASE)
         if prob_match:
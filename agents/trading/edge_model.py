@@ -59,6 +59,12 @@ def is_super_bowl_market(question: str) -> bool:
 # ==============================================================================
 # SANITY CAP FUNCTIONS
 # ==============================================================================
+# Extreme prices (<5¢ or >95¢) - model must stay within 5% of market
+EXTREME_PRICE_LOW = 0.05
+EXTREME_PRICE_HIGH = 0.95
+EXTREME_PRICE_MAX_DEVIATION = 0.05
+
+
 def apply_sanity_caps(
     model_prob: float, 
     market_prob: float, 
@@ -103,8 +109,8 @@ def apply_sanity_caps(
                 reason = f"Sports cap: {original_prob*100:.0f}%→{model_prob*100:.0f}% (max +10% over market)"
     
     # Rule 3: Extreme prices (<5¢ or >95¢) - require model within 5%
-    if market_prob < 0.05 or market_prob > 0.95:
-        max_deviation = 0.05
+    if market_prob < EXTREME_PRICE_LOW or market_prob > EXTREME_PRICE_HIGH:
+        max_deviation = EXTREME_PRICE_MAX_DEVIATION
         min_allowed = max(0.01, market_prob - max_deviation)
         max_allowed = min(0.99, market_prob + max_deviation)
         
@@ -168,7 +174,6 @@ class EdgeAnalysis:
     """Results of edge analysis for a market"""
     market: Market
     model_yes_prob: float
-    model_no_prob: float
     market_yes_price: float
     market_no_price: float
     yes_edge: float  # Positive = undervalued
@@ -187,6 +192,11 @@ class EdgeAnalysis:
     cap_reason: str = ""               # Reason for cap
     warning: str = ""                  # Warning message for user
 
+    @property
+    def model_no_prob(self) -> float:
+        """Model's probability for NO (complement of YES, derived on access)"""
+        return 1.0 - self.model_yes_prob
+
 
 class EdgeDetector:
     """
@@ -196,6 +206,31 @@ class EdgeDetector:
     def __init__(self, config: Optional[EdgeConfig] = None):
         self.config = config or EdgeConfig()
     
+    def edge_is_reachable(self, market: Market) -> bool:
+        """
+        Cheap pre-check: can any model forecast clear the edge threshold?
+        
+        At extreme prices the sanity caps pin the model to within a few
+        points of the market, so the best possible edge (after slippage) is
+        known before any context/LLM work. Returns False only when that
+        bound is below the lowest threshold analyze_edge could require.
+        """
+        market_yes = market.yes_price
+        if not self.config.apply_sanity_caps or EXTREME_PRICE_LOW <= market_yes <= EXTREME_PRICE_HIGH:
+            return True
+        
+        # Widest YES range the extreme-price cap allows (other caps only narrow it)
+        min_yes = max(0.01, market_yes - EXTREME_PRICE_MAX_DEVIATION)
+        max_yes = min(0.99, market_yes + EXTREME_PRICE_MAX_DEVIATION)
+        best_edge = max(max_yes - market_yes, (1 - min_yes) - market.no_price) * 100
+        
+        lowest_required = min(
+            self.config.min_edge_percent,
+            self.config.min_edge_short_term,
+            self.config.min_edge_sports
+        )
+        return best_edge - self.config.expected_slippage >= lowest_required
+    
     def analyze_edge(
         self, 
         market: Market, 
@@ -208,7 +243,7 @@ class EdgeDetector:
         Args:
             market: Market object with current prices
             model_yes_prob: Model's probability for YES (0-1 or 0-100)
-            model_no_prob: Model's probability for NO (optional, computed from YES)
+            model_no_prob: Model's probability for NO (optional, computed from YES; only used for edge math)
             
         Returns:
             EdgeAnalysis with recommendation
@@ -261,7 +296,6 @@ class EdgeDetector:
             return EdgeAnalysis(
                 market=market,
                 model_yes_prob=model_yes_prob,
-                model_no_prob=model_no_prob,
                 market_yes_price=market_yes,
                 market_no_price=market_no,
                 yes_edge=0,
@@ -309,7 +343,6 @@ class EdgeDetector:
                 return EdgeAnalysis(
                     market=market,
                     model_yes_prob=model_yes_prob,
-                    model_no_prob=model_no_prob,
                     market_yes_price=market_yes,
                     market_no_price=market_no,
                     yes_edge=yes_edge,
@@ -385,7 +418,6 @@ class EdgeDetector:
         return EdgeAnalysis(
             market=market,
             model_yes_prob=model_yes_prob,
-            model_no_prob=model_no_prob,
             market_yes_price=market_yes,
             market_no_price=market_no,
             yes_edge=yes_edge,
@@ -417,6 +449,16 @@ class EdgeDetector:
         return sorted(tradeable, key=lambda x: -x.edge_percent)
 
 
+# Probability parsing patterns, compiled once (tried in order)
+_LIKELIHOOD_OUTCOME_RE = re.compile(
+    r'likelihood\s*[`\'"]*([0-9.]+)[%]?[`\'"]*\s*for\s*outcome\s*of\s*[`\'"]*(\w+)', re.IGNORECASE
+)
+_PROB_FOR_OUTCOME_RE = re.compile(
+    r'([0-9.]+)\s*%?\s*(?:probability|chance|likelihood)\s*(?:for|of)\s*(\w+)', re.IGNORECASE
+)
+_QUOTED_NUMBER_RE = re.compile(r'[`\'"]([0-9.]+)[%]?[`\'"]')
+
+
 def parse_model_probability(llm_response: str) -> Tuple[Optional[float], Optional[str]]:
     """
     Parse probability from LLM response.
@@ -429,24 +471,22 @@ def parse_model_probability(llm_response: str) -> Tuple[Optional[float], Optiona
     Returns:
         (probability, outcome) or (None, None) if parsing fails
     """
-    import re
-    
     # Pattern 1: likelihood `X.X` for outcome of `Yes/No`
-    match = re.search(r'likelihood\s*[`\'"]*([0-9.]+)[%]?[`\'"]*\s*for\s*outcome\s*of\s*[`\'"]*(\w+)', llm_response, re.IGNORECASE)
+    match = _LIKELIHOOD_OUTCOME_RE.search(llm_response)
     if match:
         prob = float(match.group(1))
         outcome = match.group(2)
         return (prob if prob <= 1 else prob/100, outcome)
     
     # Pattern 2: X% probability for Yes/No
-    match = re.search(r'([0-9.]+)\s*%?\s*(?:probability|chance|likelihood)\s*(?:for|of)\s*(\w+)', llm_response, re.IGNORECASE)
+    match = _PROB_FOR_OUTCOME_RE.search(llm_response)
     if match:
         prob = float(match.group(1))
         outcome = match.group(2)
         return (prob if prob <= 1 else prob/100, outcome)
     
     # Pattern 3: Just a number in backticks
-    match = re.search(r'[`\'"]([0-9.]+)[%]?[`\'"]', llm_response)
+    match = _QUOTED_NUMBER_RE.search(llm_response)
     if match:
         prob = float(match.group(1))
         return (prob if prob <= 1 else prob/100, "Yes")  # Assume Yes if not specified
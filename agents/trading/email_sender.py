@@ -3,37 +3,95 @@ Email sender for trading reports.
 Uses Gmail SMTP to send HTML reports.
 """
 
+import base64
+import gzip
+import io
+import shutil
 import smtplib
 import ssl
 import os
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
-from email import encoders
+from email.mime.nonmultipart import MIMENonMultipart
 from datetime import datetime
 from pathlib import Path
+from typing import Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+# File buffer / copy size used while gzip-compressing attachments
+ATTACHMENT_BUFFER_SIZE = 1 << 20
+
+# HTML attachments larger than this are gzip-compressed before encoding
+GZIP_ATTACHMENT_MIN_SIZE = 64 * 1024
+
+# Plain text fallback part, identical for every report so built once
+TEXT_FALLBACK_PART = MIMEText(
+    "Polymarket Trading Report\n\n"
+    "Your HTML email client is required to view this report.\n"
+    "Please enable HTML emails or view the attached file.\n",
+    "plain",
+    "us-ascii"
+)
+
 
 class EmailSender:
     """Send trading reports via Gmail SMTP"""
     
+    # Shared TLS context so the CA store is loaded once per process
+    _SSL_CTX = ssl.create_default_context()
+    
     def __init__(self):
         self.sender_email = os.getenv("GMAIL_ADDRESS", "")
         self.app_password = os.getenv("GMAIL_APP_PASSWORD", "")
         self.recipient_email = os.getenv("REPORT_RECIPIENT", self.sender_email)
         self.smtp_server = "smtp.gmail.com"
-        self.smtp_port = 587
+        self.smtp_port = 465  # Implicit TLS (no STARTTLS round-trip)
+        self._smtp = None  # Shared connection while inside a session
         
+    def __enter__(self):
+        self.open()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+    
+    def _connect(self) -> smtplib.SMTP_SSL:
+        """Open an authenticated SMTP-over-TLS connection"""
+        server = smtplib.SMTP_SSL(
+            self.smtp_server, self.smtp_port, context=self._SSL_CTX, timeout=30
+        )
+        try:
+            server.login(self.sender_email, self.app_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def open(self):
+        """Open a connection that is reused by every send until close()"""
+        if self._smtp is None:
+            self._smtp = self._connect()
+    
+    def close(self):
+        """Close the shared connection, if any"""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except smtplib.SMTPException:
+                self._smtp.close()
+            self._smtp = None
+    
     def is_configured(self) -> bool:
         """Check if email credentials are configured"""
         return bool(self.sender_email and self.app_password)
     
     def send_html_report(
         self,
-        html_content: str,
+        html_content: Union[str, bytes],
         subject: str = None,
         recipient: str = None,
         attach_file: str = None
@@ -42,7 +100,7 @@ class EmailSender:
         Send HTML report via email.
         
         Args:
-            html_content: The HTML content to send as email body
+            html_content: The HTML content to send as email body (str, or UTF-8 bytes)
             subject: Email subject (auto-generated if not provided)
             recipient: Override recipient email
             attach_file: Optional file path to attach
@@ -71,36 +129,22 @@ class EmailSender:
             msg["From"] = self.sender_email
             msg["To"] = recipient
             
-            # Plain text fallback
-            text_content = """
-            Polymarket Trading Report
-            
-            Your HTML email client is required to view this report.
-            Please enable HTML emails or view the attached file.
-            """
-            
-            # Attach both plain text and HTML
-            part1 = MIMEText(text_content, "plain")
-            part2 = MIMEText(html_content, "html")
-            msg.attach(part1)
-            msg.attach(part2)
+            # Attach both plain text fallback and HTML
+            msg.attach(TEXT_FALLBACK_PART)
+            msg.attach(self._build_html_part(html_content))
             
             # Attach file if specified
             if attach_file and Path(attach_file).exists():
-                with open(attach_file, "rb") as f:
-                    part = MIMEBase("application", "octet-stream")
-                    part.set_payload(f.read())
-                encoders.encode_base64(part)
-                filename = Path(attach_file).name
-                part.add_header("Content-Disposition", f"attachment; filename={filename}")
-                msg.attach(part)
+                msg.attach(self._build_attachment(Path(attach_file)))
             
             # Send email
             logger.info(f"Sending email to {recipient}...")
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender_email, self.app_password)
-                server.sendmail(self.sender_email, recipient, msg.as_string())
+            # send_message serializes straight to bytes (no str round-trip)
+            if self._smtp is not None:
+                self._smtp.send_message(msg, self.sender_email, [recipient])
+            else:
+                with self._connect() as server:
+                    server.send_message(msg, self.sender_email, [recipient])
             
             logger.info(f"✅ Email sent successfully to {recipient}")
             return True
@@ -114,6 +158,39 @@ class EmailSender:
             logger.error(f"❌ Failed to send email: {e}")
             return False
     
+    def _build_html_part(self, html_content: Union[str, bytes]) -> MIMENonMultipart:
+        """Build the HTML body part; UTF-8 bytes are used as-is without a decode/encode pass"""
+        if isinstance(html_content, bytes):
+            part = MIMENonMultipart("text", "html")
+            part.set_payload(html_content, "utf-8")
+            return part
+        return MIMEText(html_content, "html")
+    
+    def _build_attachment(self, path: Path) -> MIMEBase:
+        """
+        Build a base64 attachment part for a file.
+        
+        Large HTML reports are gzip-compressed first (sent as <name>.gz);
+        the inline HTML body is unaffected, so mail clients still render it.
+        """
+        if path.suffix.lower() == ".html" and path.stat().st_size > GZIP_ATTACHMENT_MIN_SIZE:
+            compressed = io.BytesIO()
+            with open(path, "rb", buffering=ATTACHMENT_BUFFER_SIZE) as src, \
+                    gzip.GzipFile(filename=path.name, mode="wb", fileobj=compressed, compresslevel=6) as gz:
+                shutil.copyfileobj(src, gz, ATTACHMENT_BUFFER_SIZE)
+            # getbuffer() exposes the compressed bytes without another copy
+            return self._build_base64_part(compressed.getbuffer(), "gzip", f"{path.name}.gz")
+        
+        return self._build_base64_part(path.read_bytes(), "octet-stream", path.name)
+    
+    def _build_base64_part(self, data: bytes, subtype: str, filename: str) -> MIMEBase:
+        """Build an application/<subtype> part with a base64 payload (one encodebytes pass)"""
+        part = MIMEBase("application", subtype)
+        part.set_payload(base64.encodebytes(data).decode("ascii"))
+        part["Content-Transfer-Encoding"] = "base64"
+        part.add_header("Content-Disposition", f"attachment; filename={filename}")
+        return part
+    
     def send_report_file(self, html_file_path: str, recipient: str = None) -> bool:
         """
         Send an HTML report file via email.
@@ -130,7 +207,7 @@ class EmailSender:
             logger.error(f"HTML file not found: {html_file_path}")
             return False
         
-        html_content = path.read_text(encoding="utf-8")
+        html_content = path.read_bytes()
         
         # Extract date from filename if possible
         subject = f"🎯 Polymarket Report - {path.stem}"
@@ -3,16 +3,29 @@ Market Selection Filters
 Implements strict filtering criteria for trade candidates.
 Includes EOY mode for end-of-year markets with relaxed thresholds.
 """
+import heapq
 import logging
 import re
-from typing import List, Optional, Tuple
+import string
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass, field
 
+import numpy as np
+
 from agents.trading.api_client import Market
 
 logger = logging.getLogger(__name__)
 
+# Numba JIT for the pass-mask kernel (optional - NumPy fallback if not installed)
+try:
+    from numba import njit
+    NUMBA_SUPPORT = True
+except ImportError:
+    NUMBA_SUPPORT = False
+
 # Category whitelist for EOY mode - prioritize these
 EOY_PRIORITY_CATEGORIES = ['Politics', 'Crypto', 'Sports', 'Economics', 'AI', 'Tech']
 
@@ -26,14 +39,40 @@ CATEGORY_KEYWORDS = {
     'Tech': ['apple', 'google', 'microsoft', 'nvidia', 'meta', 'amazon', 'tesla', 'ceo', 'ipo', 'acquisition']
 }
 
+# Question tokenizer: punctuation and digits become spaces, so split() yields whole words
+_TOKEN_TRANSLATION = str.maketrans({c: ' ' for c in string.punctuation + string.digits})
 
-def infer_category(question: str) -> Optional[str]:
-    """Infer category from question text using keyword matching"""
-    q_lower = question.lower()
+
+def _build_category_matchers():
+    """
+    Per category, in CATEGORY_KEYWORDS order: single-word keywords as a set for
+    token intersection, plus one whole-word regex for multi-word/punctuated
+    keywords ("s&p", "super bowl").
+    """
+    matchers = []
     for category, keywords in CATEGORY_KEYWORDS.items():
-        for kw in keywords:
-            if kw in q_lower:
-                return category
+        words = frozenset(kw for kw in keywords if kw.isalpha())
+        phrases = [kw for kw in keywords if not kw.isalpha()]
+        phrase_pattern = (
+            re.compile(r'(?<!\w)(?:' + '|'.join(re.escape(kw) for kw in phrases) + r')(?!\w)', re.IGNORECASE)
+            if phrases else None
+        )
+        matchers.append((category, words, phrase_pattern))
+    return matchers
+
+
+_CATEGORY_MATCHERS = _build_category_matchers()
+
+
+@lru_cache(maxsize=4096)
+def infer_category(question: str) -> Optional[str]:
+    """Infer category from question text using keyword matching (memoized per question)"""
+    tokens = set(question.lower().translate(_TOKEN_TRANSLATION).split())
+    for category, words, phrase_pattern in _CATEGORY_MATCHERS:
+        if not words.isdisjoint(tokens):
+            return category
+        if phrase_pattern is not None and phrase_pattern.search(question):
+            return category
     return None
 
 
@@ -53,12 +92,142 @@ class FilterConfig:
     min_low_outcome_price: float = 0.05   # Exclude if lowest price < 5%
     
     # Category filters (optional)
-    excluded_categories: List[str] = None
-    included_categories: List[str] = None
+    excluded_categories: Optional[FrozenSet[str]] = None
+    included_categories: Optional[FrozenSet[str]] = None
     
     # EOY mode specific
     eoy_mode: bool = False
-    priority_categories: List[str] = None
+    priority_categories: Optional[FrozenSet[str]] = None
+    
+    # Rejection logging: "full" (per-market entries + near-misses),
+    # "summary" (reason counts only) or "none"
+    log_rejections: str = "full"
+    
+    def __post_init__(self):
+        # Category lists are only used for membership tests
+        if self.priority_categories is not None:
+            self.priority_categories = frozenset(self.priority_categories)
+        if self.excluded_categories is not None:
+            self.excluded_categories = frozenset(self.excluded_categories)
+        if self.included_categories is not None:
+            self.included_categories = frozenset(self.included_categories)
+
+
+# Explicit signature: compiled eagerly at import and cached to __pycache__, so
+# later runs load the machine code instead of recompiling on the first call.
+# The cache is keyed on this source file only - runtime state such as open
+# positions never invalidates it.
+_PASS_MASK_SIGNATURE = (
+    "b1[::1](b1[::1], b1[::1], f8[::1], f8[::1], f8[::1], f8[::1], f8[::1],"
+    " f8, f8, f8, f8, f8, f8)"
+)
+
+if NUMBA_SUPPORT:
+    @njit(_PASS_MASK_SIGNATURE, cache=True)
+    def _pass_mask_kernel(
+        closed, active, vol, vol_24h, days, min_price, max_price,
+        min_total_volume, min_volume_24h, min_days, max_days, max_high_price, min_low_price
+    ):
+        """Fused single-loop pass mask; NaN days/prices fail every comparison"""
+        n = vol.shape[0]
+        mask = np.zeros(n, dtype=np.bool_)
+        for i in range(n):
+            mask[i] = (
+                not closed[i] and active[i]
+                and vol[i] >= min_total_volume
+                and vol_24h[i] >= min_volume_24h
+                and days[i] >= min_days
+                and days[i] <= max_days
+                and max_price[i] <= max_high_price
+                and min_price[i] >= min_low_price
+            )
+        return mask
+
+
+def make_market_checker(config: FilterConfig) -> Callable[[Market], Tuple[Optional[str], float]]:
+    """
+    Specialize the per-market filter check for a fixed FilterConfig.
+    
+    Thresholds are bound once as closure locals so the check does not go
+    through config attribute lookups for every market.
+    
+    Returns:
+        Function mapping a market to (rejection reason or None, near-miss score 0-100)
+    """
+    min_total_volume = config.min_total_volume
+    min_volume_24h = config.min_volume_24h
+    min_days = config.min_days_to_resolution
+    max_days = config.max_days_to_resolution
+    max_high_price = config.max_high_outcome_price
+    min_low_price = config.min_low_outcome_price
+    eoy_mode = config.eoy_mode
+    priority_categories = config.priority_categories
+    boost_priority = bool(eoy_mode and priority_categories)
+    
+    def check(market: Market) -> Tuple[Optional[str], float]:
+        # Check if market is closed
+        if market.closed:
+            return ("Market is closed", 0)
+        
+        # Check if market is active
+        if not market.active:
+            return ("Market is not active", 0)
+        
+        score = 100.0  # Start with perfect score, deduct for failures
+        
+        # Check total volume
+        volume = market.volume
+        if volume < min_total_volume:
+            # Calculate how close to passing
+            vol_ratio = volume / min_total_volume
+            score = score * vol_ratio
+            return (f"Low total volume: ${volume:,.0f} < ${min_total_volume:,.0f}", score)
+        
+        # Check 24h volume
+        volume_24h = market.volume_24h
+        if volume_24h < min_volume_24h:
+            vol_ratio = volume_24h / min_volume_24h if min_volume_24h > 0 else 0
+            score = score * max(vol_ratio, 0.5)  # Don't penalize too much
+            return (f"Low 24h volume: ${volume_24h:,.0f} < ${min_volume_24h:,.0f}", score)
+        
+        # Check days to resolution
+        days = market.days_to_resolution
+        if days is None:
+            return ("No resolution date", 0)
+        
+        if days < min_days:
+            # Near-term markets in EOY mode get higher score
+            if eoy_mode and days >= 1:
+                score = score * 0.9  # Small penalty
+            else:
+                score = score * 0.5
+            return (f"Too close to resolution: {days} days < {min_days} days", score)
+        
+        if days > max_days:
+            return (f"Too far from resolution: {days} days > {max_days} days", score * 0.3)
+        
+        # Check price constraints (avoid near-certain outcomes)
+        min_price, max_price = market.price_bounds
+        
+        if max_price > max_high_price:
+            # Calculate how certain - markets closer to 0.95 score better than 0.99
+            certainty_penalty = (max_price - max_high_price) / (1 - max_high_price)
+            score = score * (1 - certainty_penalty * 0.5)
+            return (f"Outcome too certain: highest price ${max_price:.2f} > ${max_high_price:.2f}", score)
+        
+        if min_price < min_low_price:
+            return (f"Outcome too unlikely: lowest price ${min_price:.2f} < ${min_low_price:.2f}", score * 0.4)
+        
+        # EOY mode: Boost score for priority categories
+        if boost_priority:
+            category = infer_category(market.question)
+            if category and category in priority_categories:
+                score = min(score * 1.2, 100)  # Boost priority category markets
+        
+        # All checks passed
+        return (None, score)
+    
+    return check
 
 
 class MarketFilter:
@@ -72,6 +241,8 @@ class MarketFilter:
         self.config = config or FilterConfig()
         self.rejection_log: List[dict] = []
         self.near_misses: List[dict] = []  # Track markets that almost passed
+        self._reason_counts: Counter = Counter()  # Rejection counts by reason type
+        self._near_miss_heap: List[tuple] = []  # Min-heap of (score, -seq, entry), top 5 kept
     
     def filter_markets(self, markets: List[Market]) -> List[Market]:
         """
@@ -82,93 +253,118 @@ class MarketFilter:
         """
         self.rejection_log = []
         self.near_misses = []
+        self._reason_counts = Counter()
+        self._near_miss_heap = []
         passed = []
+        check = make_market_checker(self.config)
         
         for market in markets:
-            rejection_reason, near_miss_score = self._check_market(market)
+            rejection_reason, near_miss_score = check(market)
             if rejection_reason:
                 self._log_rejection(market, rejection_reason, near_miss_score)
             else:
                 passed.append(market)
         
         # Sort near-misses by score (higher = closer to passing)
-        self.near_misses = sorted(self.near_misses, key=lambda x: -x.get('score', 0))[:5]
+        self.near_misses = [entry for _, _, entry in sorted(self._near_miss_heap, reverse=True)]
         
         logger.info(f"Market filtering: {len(passed)}/{len(markets)} passed")
         self._print_rejection_summary()
         
         return passed
     
-    def _check_market(self, market: Market) -> Tuple[Optional[str], float]:
+    def filter_markets_vec(self, markets: List[Market], record_rejections: bool = True) -> List[Market]:
         """
-        Check if market passes all filters.
+        Vectorized variant of filter_markets.
+        
+        Pass/fail is decided with NumPy column predicates; the per-market
+        checker only runs on rejected markets, and only when
+        record_rejections is set (to fill the rejection log and near-misses).
         
         Returns:
-            Tuple of (rejection reason string or None, near-miss score 0-100)
+            List of markets that pass all filters
         """
-        score = 100.0  # Start with perfect score, deduct for failures
-        
-        # Check if market is closed
-        if market.closed:
-            return ("Market is closed", 0)
-        
-        # Check if market is active
-        if not market.active:
-            return ("Market is not active", 0)
-        
-        # Check total volume
-        if market.volume < self.config.min_total_volume:
-            # Calculate how close to passing
-            vol_ratio = market.volume / self.config.min_total_volume
-            score = score * vol_ratio
-            return (f"Low total volume: ${market.volume:,.0f} < ${self.config.min_total_volume:,.0f}", score)
-        
-        # Check 24h volume
-        if market.volume_24h < self.config.min_volume_24h:
-            vol_ratio = market.volume_24h / self.config.min_volume_24h if self.config.min_volume_24h > 0 else 0
-            score = score * max(vol_ratio, 0.5)  # Don't penalize too much
-            return (f"Low 24h volume: ${market.volume_24h:,.0f} < ${self.config.min_volume_24h:,.0f}", score)
-        
-        # Check days to resolution
-        days = market.days_to_resolution
-        if days is None:
-            return ("No resolution date", 0)
+        self.rejection_log = []
+        self.near_misses = []
+        self._reason_counts = Counter()
+        self._near_miss_heap = []
+        if not markets:
+            return []
         
-        if days < self.config.min_days_to_resolution:
-            # Near-term markets in EOY mode get higher score
-            if self.config.eoy_mode and days >= 1:
-                score = score * 0.9  # Small penalty
-            else:
-                score = score * 0.5
-            return (f"Too close to resolution: {days} days < {self.config.min_days_to_resolution} days", score)
+        passed = []
+        check = make_market_checker(self.config)
+        for market, ok in zip(markets, self._pass_mask(markets).tolist()):
+            if ok:
+                passed.append(market)
+            elif record_rejections:
+                rejection_reason, near_miss_score = check(market)
+                if rejection_reason:
+                    self._log_rejection(market, rejection_reason, near_miss_score)
         
-        if days > self.config.max_days_to_resolution:
-            return (f"Too far from resolution: {days} days > {self.config.max_days_to_resolution} days", score * 0.3)
+        self.near_misses = [entry for _, _, entry in sorted(self._near_miss_heap, reverse=True)]
         
-        # Check price constraints (avoid near-certain outcomes)
-        max_price = max(market.outcome_prices)
-        min_price = min(market.outcome_prices)
+        logger.info(f"Market filtering: {len(passed)}/{len(markets)} passed")
+        self._print_rejection_summary()
         
-        if max_price > self.config.max_high_outcome_price:
-            # Calculate how certain - markets closer to 0.95 score better than 0.99
-            certainty_penalty = (max_price - self.config.max_high_outcome_price) / (1 - self.config.max_high_outcome_price)
-            score = score * (1 - certainty_penalty * 0.5)
-            return (f"Outcome too certain: highest price ${max_price:.2f} > ${self.config.max_high_outcome_price:.2f}", score)
+        return passed
+    
+    def _pass_mask(self, markets: List[Market]) -> np.ndarray:
+        """Boolean mask of markets passing every filter, computed column-wise"""
+        cfg = self.config
+        n = len(markets)
+        closed = np.fromiter((m.closed for m in markets), dtype=bool, count=n)
+        active = np.fromiter((m.active for m in markets), dtype=bool, count=n)
+        vol = np.fromiter((m.volume for m in markets), dtype=np.float64, count=n)
+        vol_24h = np.fromiter((m.volume_24h for m in markets), dtype=np.float64, count=n)
+        days = np.fromiter(
+            (np.nan if d is None else d for d in (m.days_to_resolution for m in markets)),
+            dtype=np.float64, count=n
+        )
+        bounds = np.array(
+            [m.price_bounds if m.outcome_prices else (np.nan, np.nan) for m in markets],
+            dtype=np.float64
+        ).reshape(n, 2)
+        min_price = np.ascontiguousarray(bounds[:, 0])
+        max_price = np.ascontiguousarray(bounds[:, 1])
         
-        if min_price < self.config.min_low_outcome_price:
-            return (f"Outcome too unlikely: lowest price ${min_price:.2f} < ${self.config.min_low_outcome_price:.2f}", score * 0.4)
+        if NUMBA_SUPPORT:
+            return _pass_mask_kernel(
+                closed, active, vol, vol_24h, days, min_price, max_price,
+                float(cfg.min_total_volume), float(cfg.min_volume_24h),
+                float(cfg.min_days_to_resolution), float(cfg.max_days_to_resolution),
+                float(cfg.max_high_outcome_price), float(cfg.min_low_outcome_price)
+            )
         
-        # EOY mode: Boost score for priority categories
-        if self.config.eoy_mode and self.config.priority_categories:
-            category = infer_category(market.question)
-            if category and category in self.config.priority_categories:
-                score = min(score * 1.2, 100)  # Boost priority category markets
+        # NaN (missing resolution date / prices) fails every comparison
+        return (
+            ~closed & active
+            & (vol >= cfg.min_total_volume)
+            & (vol_24h >= cfg.min_volume_24h)
+            & (days >= cfg.min_days_to_resolution)
+            & (days <= cfg.max_days_to_resolution)
+            & (max_price <= cfg.max_high_outcome_price)
+            & (min_price >= cfg.min_low_outcome_price)
+        )
+    
+    def _check_market(self, market: Market) -> Tuple[Optional[str], float]:
+        """
+        Check if market passes all filters.
         
-        # All checks passed
-        return (None, score)
+        Returns:
+            Tuple of (rejection reason string or None, near-miss score 0-100)
+        """
+        return make_market_checker(self.config)(market)
     
     def _log_rejection(self, market: Market, reason: str, near_miss_score: float = 0):
-        """Log rejected market with reason"""
+        """Log rejected market with reason (detail depends on config.log_rejections)"""
+        mode = self.config.log_rejections
+        if mode == "none":
+            return
+        
+        self._reason_counts[reason.split(":", 1)[0]] += 1
+        if mode != "full":
+            return
+        
         entry = {
             "market_id": market.id,
             "question": market.question[:60] + "..." if len(market.question) > 60 else market.question,
@@ -184,28 +380,32 @@ class MarketFilter:
         }
         self.rejection_log.append(entry)
         
-        # Track near-misses (score > 40 means it was close)
+        # Track top 5 near-misses (score > 40 means it was close); -seq keeps
+        # earlier markets ahead on equal scores
         if near_miss_score > 40:
-            self.near_misses.append(entry)
+            item = (near_miss_score, -len(self.rejection_log), entry)
+            if len(self._near_miss_heap) < 5:
+                heapq.heappush(self._near_miss_heap, item)
+            else:
+                heapq.heappushpop(self._near_miss_heap, item)
     
     def _print_rejection_summary(self):
         """Print summary of rejection reasons"""
-        if not self.rejection_log:
+        if not self._reason_counts:
             return
         
-        reasons = {}
-        for item in self.rejection_log:
-            reason_type = item["reason"].split(":")[0]
-            reasons[reason_type] = reasons.get(reason_type, 0) + 1
-        
         logger.info("Rejection summary:")
-        for reason, count in sorted(reasons.items(), key=lambda x: -x[1]):
+        for reason, count in self._reason_counts.most_common():
             logger.info(f"  - {reason}: {count}")
     
     def get_rejection_log(self) -> List[dict]:
         """Get full rejection log"""
         return self.rejection_log
     
+    def get_rejection_counts(self) -> Dict[str, int]:
+        """Get rejection counts by reason type (available in "summary" and "full" modes)"""
+        return dict(self._reason_counts)
+    
     def get_near_misses(self) -> List[dict]:
         """Get top 5 markets that almost passed filters"""
         return self.near_misses
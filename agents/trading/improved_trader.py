@@ -4,21 +4,28 @@ Integrates all modules for safe, high-quality trade recommendations.
 Supports EOY mode with relaxed filters for end-of-year markets.
 Now uses Dual AI (GPT-4o-mini + Grok) for ensemble forecasting.
 """
+import io
 import os
 import json
+import time
+import asyncio
+import hashlib
 import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional, List, Dict
 from pathlib import Path
 from dotenv import load_dotenv
+import orjson
 
 from agents.trading.api_client import PolymarketAPIClient, Market
 from agents.trading.filters import MarketFilter, FilterConfig, get_relaxed_config, get_eoy_config, get_test_config
 from agents.trading.edge_model import EdgeDetector, EdgeConfig, EdgeAnalysis, TradeAction, parse_model_probability, get_relaxed_edge_config
-from agents.trading.position_sizing import PositionSizer, PositionConfig
-from agents.trading.recommendation_generator import RecommendationGenerator
+from agents.trading.position_sizing import PositionSizer, PositionConfig, PositionRecommendation
+from agents.trading.recommendation_generator import RecommendationGenerator, ReportInputs, ReportStats
 from agents.trading.email_sender import EmailSender
-from agents.trading.bracket_strategy import BracketDetector, BracketStrategyGenerator, BracketStrategy
+from agents.trading.bracket_strategy import BracketDetector, BracketStrategyGenerator, BracketStrategy, BracketMarket
 from agents.trading.dual_forecaster import DualForecaster, ForecastResult
 from agents.application.prompts import Prompter
 from agents.connectors.search import tavily_client
@@ -32,47 +39,155 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Position tracking file
+# Position tracking database (legacy JSON file is imported on first use)
+POSITIONS_DB = "active_positions.db"
 POSITIONS_FILE = "active_positions.json"
 MAX_CONCURRENT_POSITIONS = 5
+MAX_CONCURRENT_FORECASTS = 5  # Cap on parallel context lookups
+
+# Real-time context cache (Tavily + News), shared across runs
+CONTEXT_CACHE_DIR = ".cache/context"
+CONTEXT_CACHE_TTL = 6 * 3600     # 6 hours for successful lookups
+CONTEXT_FAILURE_TTL = 5 * 60     # 5 minutes when a source failed
+CONTEXT_LOOKUP_TIMEOUT = 10      # Seconds to wait for each context source
+
+# On-chain USDC balance cache: (expires_at, balance)
+BANKROLL_CACHE_TTL = 60  # seconds
+_bankroll_cache: Optional[tuple] = None
+
+# Shared pool for the parallel Tavily/News lookups in _gather_context
+CONTEXT_EXECUTOR = ThreadPoolExecutor(max_workers=2 * MAX_CONCURRENT_FORECASTS, thread_name_prefix="context")
 
 
 class PositionTracker:
-    """Track concurrent positions to prevent over-trading"""
+    """Track concurrent positions to prevent over-trading (SQLite, WAL mode)"""
     
-    def __init__(self, filepath: str = POSITIONS_FILE):
+    def __init__(self, filepath: str = POSITIONS_DB, legacy_filepath: str = POSITIONS_FILE):
         self.filepath = Path(filepath)
-        self.positions = self._load()
+        self.conn = sqlite3.connect(str(self.filepath), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS positions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    market_id TEXT NOT NULL,
+                    question TEXT,
+                    action TEXT,
+                    amount REAL,
+                    timestamp TEXT
+                )"""
+            )
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'count_offset'").fetchone()
+        self._count_offset = row[0] if row else 0
+        self._count = self._query_count()
+        if self._count == 0 and row is None:
+            self._import_legacy(Path(legacy_filepath))
+        self._dirty = False
     
-    def _load(self) -> Dict:
-        if self.filepath.exists():
-            try:
-                with open(self.filepath, 'r') as f:
-                    return json.load(f)
-            except:
-                return {"positions": [], "count": 0}
-        return {"positions": [], "count": 0}
+    def _query_count(self) -> int:
+        rows = self.conn.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+        return max(0, rows + self._count_offset)
     
-    def _save(self):
-        with open(self.filepath, 'w') as f:
-            json.dump(self.positions, f, indent=2, default=str)
+    def _import_legacy(self, legacy_path: Path):
+        """
+        One-time import of positions from the old JSON tracker file.
+        
+        Runs only while the database is empty and has never imported before;
+        afterwards the database is authoritative and edits to the JSON file
+        are ignored. The legacy "count" field gated new positions, so any
+        difference between it and the stored list is kept as a count offset.
+        """
+        try:
+            legacy = orjson.loads(legacy_path.read_bytes())
+        except FileNotFoundError:
+            return
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Could not read legacy positions file {legacy_path}: {e}")
+            return
+        if not isinstance(legacy, dict):
+            logger.warning(f"Ignoring legacy positions file {legacy_path}: expected a JSON object")
+            return
+        positions = [p for p in legacy.get("positions") or [] if isinstance(p, dict)]
+        rows = [
+            (p.get("market_id"), p.get("question"), p.get("action"), p.get("amount"), p.get("timestamp"))
+            for p in positions
+        ]
+        count = legacy.get("count")
+        if not isinstance(count, int) or isinstance(count, bool):
+            count = len(rows)
+        self._count_offset = count - len(rows)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO positions (market_id, question, action, amount, timestamp) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('count_offset', ?)",
+                (self._count_offset,)
+            )
+        self._count = self._query_count()
+        logger.info(f"Imported {len(rows)} positions (count {count}) from {legacy_path}")
     
     def can_add_position(self) -> bool:
-        return self.positions["count"] < MAX_CONCURRENT_POSITIONS
+        return self._count < MAX_CONCURRENT_POSITIONS
     
     def add_position(self, market_id: str, question: str, action: str, amount: float):
-        self.positions["positions"].append({
-            "market_id": market_id,
-            "question": question[:50],
-            "action": action,
-            "amount": amount,
-            "timestamp": datetime.now().isoformat()
-        })
-        self.positions["count"] = len(self.positions["positions"])
-        self._save()
+        # Buffered in the open transaction; flush() commits all pending inserts at once
+        self.conn.execute(
+            "INSERT INTO positions (market_id, question, action, amount, timestamp) VALUES (?, ?, ?, ?, ?)",
+            (market_id, question[:50], action, amount, datetime.now().isoformat())
+        )
+        self._count += 1
+        self._dirty = True
+    
+    def flush(self):
+        """Commit buffered position inserts"""
+        if self._dirty:
+            self.conn.commit()
+            self._dirty = False
+    
+    def close(self):
+        """Commit buffered inserts and close the database connection"""
+        self.flush()
+        self.conn.close()
     
     def get_count(self) -> int:
-        return self.positions["count"]
+        return self._count
+
+
+class ContextCache:
+    """On-disk cache of gathered market context, keyed by a hash of the question"""
+    
+    def __init__(self, directory: str = CONTEXT_CACHE_DIR):
+        self.directory = Path(directory)
+    
+    def _path(self, question: str) -> Path:
+        key = hashlib.sha1(question.lower().strip().encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.json"
+    
+    def get(self, question: str) -> Optional[str]:
+        """Return cached context, or None if missing or expired"""
+        try:
+            with open(self._path(question), 'r', encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("expires", 0) < time.time():
+            return None
+        return entry.get("context")
+    
+    def set(self, question: str, context: str, ttl: float):
+        """Store context for ttl seconds (atomic replace, safe across threads)"""
+        path = self._path(question)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{id(context)}.tmp")
+            with open(tmp_path, 'w', encoding="utf-8") as f:
+                json.dump({"expires": time.time() + ttl, "context": context}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write context cache: {e}")
 
 
 class ImprovedTrader:
@@ -121,10 +236,11 @@ class ImprovedTrader:
         self.forecaster = DualForecaster()
         self.prompter = Prompter()
         self.news = News()
+        self.context_cache = ContextCache()
         
         # Portfolio state
         self.polymarket = Polymarket()
-        self.bankroll = self.polymarket.get_usdc_balance()
+        self.bankroll = self._get_bankroll()
         
         # Adjust position sizing based on bankroll size
         # Small bankrolls need larger % to meet minimum trade size
@@ -167,10 +283,37 @@ class ImprovedTrader:
         self.bracket_detector = BracketDetector()
         self.bracket_generator = BracketStrategyGenerator(self.bracket_detector)
     
+    def _get_bankroll(self) -> float:
+        """USDC balance, reused for BANKROLL_CACHE_TTL seconds across trader instances"""
+        global _bankroll_cache
+        now = time.time()
+        if _bankroll_cache and _bankroll_cache[0] > now:
+            return _bankroll_cache[1]
+        balance = self.polymarket.get_usdc_balance()
+        _bankroll_cache = (now + BANKROLL_CACHE_TTL, balance)
+        return balance
+    
     def run_analysis(self, max_markets: int = 500) -> List[str]:
         """
         Run full analysis pipeline.
         
+        Args:
+            max_markets: Maximum markets to fetch (default 500 with pagination)
+        
+        Returns:
+            List of saved recommendation filenames
+        """
+        try:
+            return asyncio.run(self.run_analysis_async(max_markets))
+        finally:
+            # Returned files must exist on disk before the caller sees them
+            self.recommendation_gen.await_writes()
+            self.position_tracker.close()
+    
+    async def run_analysis_async(self, max_markets: int = 500) -> List[str]:
+        """
+        Run full analysis pipeline, forecasting candidate markets concurrently.
+        
         Args:
             max_markets: Maximum markets to fetch (default 500 with pagination)
         
@@ -179,14 +322,14 @@ class ImprovedTrader:
         """
         logger.info("=" * 60)
         logger.info("STARTING IMPROVED TRADER ANALYSIS")
-        logger.info(f"Mode: {self.mode.upper()}")
+        logger.info("Mode: %s", self.mode.upper())
         logger.info("=" * 60)
-        logger.info(f"Bankroll: ${self.bankroll:.2f}")
-        logger.info(f"Current positions: {self.position_tracker.get_count()}/{MAX_CONCURRENT_POSITIONS}")
+        logger.info("Bankroll: $%.2f", self.bankroll)
+        logger.info("Current positions: %d/%d", self.position_tracker.get_count(), MAX_CONCURRENT_POSITIONS)
         
         # Check if we can add more positions
         if not self.position_tracker.can_add_position():
-            logger.warning(f"⚠️ Maximum positions ({MAX_CONCURRENT_POSITIONS}) reached!")
+            logger.warning("⚠️ Maximum positions (%d) reached!", MAX_CONCURRENT_POSITIONS)
             no_trade = self.recommendation_gen.generate_no_trade(
                 f"Maximum concurrent positions ({MAX_CONCURRENT_POSITIONS}) reached. Wait for current positions to resolve."
             )
@@ -197,7 +340,7 @@ class ImprovedTrader:
         logger.info("\n📥 Fetching markets from Polymarket API...")
         markets = self.api_client.get_all_active_markets(max_markets=max_markets, sort_by_volume=True)
         self.markets_scanned = len(markets)
-        logger.info(f"Fetched {self.markets_scanned} markets")
+        logger.info("Fetched %d markets", self.markets_scanned)
         
         if not markets:
             logger.error("No markets retrieved from API")
@@ -205,9 +348,10 @@ class ImprovedTrader:
         
         # Step 2: Apply filters
         logger.info("\n🔍 Applying market filters...")
-        filtered_markets = self.market_filter.filter_markets(markets)
+        # Vectorized pass/fail; the detailed checker only runs on rejects
+        filtered_markets = self.market_filter.filter_markets_vec(markets)
         self.markets_passed_filter = len(filtered_markets)
-        logger.info(f"{self.markets_passed_filter} markets passed filters")
+        logger.info("%d markets passed filters", self.markets_passed_filter)
         
         # Get near-misses for output
         near_misses = self.market_filter.get_near_misses()
@@ -221,12 +365,39 @@ class ImprovedTrader:
             filename = self.recommendation_gen.save_recommendation(no_trade, "no_trade")
             return [filename]
         
+        # Bracket grouping only needs the fetched markets - overlap it with the LLM work
+        bracket_task = asyncio.create_task(
+            asyncio.to_thread(self.bracket_detector.group_related_markets, markets)
+        )
+        
         # Step 3: Analyze each market for edge
         logger.info("\n📊 Analyzing markets for trading edge...")
         recommendations = []
-        
+        candidates = []
         for market in filtered_markets[:10]:  # Analyze top 10 by volume
-            rec_file = self._analyze_market(market)
+            # Extreme prices can't clear the edge threshold - skip the LLM/context work
+            if not self.edge_detector.edge_is_reachable(market):
+                logger.info("⏭️ Skipping %s... (edge capped at $%.2f YES)", market.question[:50], market.yes_price)
+                continue
+            candidates.append(market)
+        
+        # Context lookups run concurrently and forecasts go out as one batch;
+        # sizing and position tracking then run in order below
+        forecasts = await self._forecast_markets(candidates)
+        
+        analyses = []
+        for market, forecast in zip(candidates, forecasts):
+            if forecast is None:  # Forecast failed (already logged)
+                continue
+            analysis = self._evaluate_market(market, forecast)
+            if analysis is not None:
+                analyses.append(analysis)
+        
+        # Size every tradeable edge in one vectorized call
+        positions = self.position_sizer.calculate_positions_batch(analyses)
+        
+        for analysis, position in zip(analyses, positions):
+            rec_file = self._recommend_trade(analysis, position)
             if rec_file:
                 recommendations.append(rec_file)
                 self.trades_recommended += 1
@@ -236,37 +407,55 @@ class ImprovedTrader:
                     logger.info("Reached maximum concurrent positions")
                     break
         
+        self.position_tracker.flush()
+        
+        # Only count recommendations whose file actually reached disk
+        failed = self.recommendation_gen.await_writes()
+        if failed:
+            recommendations = [f for f in recommendations if f not in failed]
+            self.trades_recommended -= len(failed)
+            logger.warning("⚠️ %d recommendation file(s) could not be saved", len(failed))
+        
         # Step 3.5: Detect bracket strategies (combined bets on related markets)
         logger.info("\n📊 Detecting bracket strategies...")
-        self._detect_bracket_strategies(markets)
+        try:
+            bracket_groups = await bracket_task
+        except Exception as e:
+            logger.warning("Bracket grouping failed: %s", e)
+            bracket_groups = {}
+        self._detect_bracket_strategies(bracket_groups)
         
         # Step 4: Generate summary (both text and HTML)
         logger.info("\n📋 Generating daily summary...")
-        
-        # Text summary for console/logs
-        summary = self.recommendation_gen.generate_daily_summary(
+        stats = ReportStats.from_counts(
             markets_scanned=self.markets_scanned,
             markets_valid=self.markets_passed_filter,
             trades_recommended=self.trades_recommended,
-            rejections_by_reason=self._get_all_rejections(),
+            rejections_by_reason=self._get_all_rejections()
+        )
+        # Table rows prepared once from this run's markets for both summaries
+        report_inputs = ReportInputs.from_markets(self.analyzed_markets, near_misses)
+        
+        # Text summary for console/logs
+        summary = self.recommendation_gen.generate_daily_summary(
+            stats=stats,
             near_misses=near_misses,
             analyzed_markets=self.analyzed_markets,
-            bracket_strategies=self.bracket_strategies
+            bracket_strategies=self.bracket_strategies,
+            inputs=report_inputs
         )
         summary_file = self.recommendation_gen.save_recommendation(summary, "daily_summary")
         
         # HTML report (pretty version)
         html_report = self.recommendation_gen.generate_html_summary(
-            markets_scanned=self.markets_scanned,
-            markets_valid=self.markets_passed_filter,
-            trades_recommended=self.trades_recommended,
-            rejections_by_reason=self._get_all_rejections(),
+            stats=stats,
             near_misses=near_misses,
             analyzed_markets=self.analyzed_markets,
-            bracket_strategies=self.bracket_strategies
+            bracket_strategies=self.bracket_strategies,
+            inputs=report_inputs
         )
         html_file = self.recommendation_gen.save_html(html_report, "trading_report")
-        logger.info(f"📄 HTML report saved: {html_file}")
+        logger.info("📄 HTML report saved: %s", html_file)
         
         # Email report if configured
         email_sender = EmailSender()
@@ -279,29 +468,95 @@ class ImprovedTrader:
         else:
             logger.info("📧 Email not configured - skipping (set GMAIL_APP_PASSWORD in .env)")
         
-        logger.info(f"\n✅ Analysis complete!")
-        logger.info(f"   Markets scanned: {self.markets_scanned}")
-        logger.info(f"   Markets passed filters: {self.markets_passed_filter}")
-        logger.info(f"   Trades recommended: {self.trades_recommended}")
+        logger.info("\n✅ Analysis complete!")
+        logger.info("   Markets scanned: %d", self.markets_scanned)
+        logger.info("   Markets passed filters: %d", self.markets_passed_filter)
+        logger.info("   Trades recommended: %d", self.trades_recommended)
         
         return recommendations
     
-    def _analyze_market(self, market: Market) -> Optional[str]:
-        """Analyze a single market for trading opportunity"""
-        logger.info(f"\n--- Analyzing: {market.question[:60]}...")
+    async def _forecast_markets(self, markets: List[Market]) -> List[Optional[ForecastResult]]:
+        """
+        Gather context for all markets concurrently, then forecast them with a
+        single batched superforecaster request per AI. Markets the batch
+        leaves without any forecast are retried one at a time.
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FORECASTS)
         
-        self._last_forecast = None  # Reset forecast tracking
+        async def context_for(market: Market) -> str:
+            async with semaphore:
+                return await asyncio.to_thread(self._gather_context, market.question)
+        
+        contexts = await asyncio.gather(*(context_for(m) for m in markets))
         
         try:
-            # Get real-time context
-            context = self._gather_context(market.question)
-            
-            # Get dual AI forecast
-            model_prob, outcome = self._get_llm_forecast(market, context)
+            results = await asyncio.to_thread(self.forecaster.forecast_batch, [
+                {
+                    "question": market.question,
+                    "description": market.description,
+                    "outcomes": market.outcomes,
+                    "context": context,
+                }
+                for market, context in zip(markets, contexts)
+            ], self.prompter.superforecaster)
+        except Exception as e:
+            logger.error("Batch forecast failed: %s", e)
+            results = [None] * len(markets)
+        
+        for i, (market, context, result) in enumerate(zip(markets, contexts, results)):
+            if result is None or (result.gpt_prob is None and result.grok_prob is None):
+                logger.info("↩️ No batch forecast for %s... - forecasting individually", market.question[:40])
+                try:
+                    results[i] = await asyncio.to_thread(self._get_llm_forecast, market, context)
+                except Exception as e:
+                    logger.error("Forecast failed for market %s: %s", market.id, e)
+                continue
+            logger.info("📊 Dual AI [%s]: %s", market.question[:40], result.reasoning)
+        return results
+    
+    def _forecast_market(self, market: Market) -> ForecastResult:
+        """Get real-time context and dual AI forecast for a single market"""
+        context = self._gather_context(market.question)
+        return self._get_llm_forecast(market, context)
+    
+    def _analyze_market(self, market: Market, forecast: Optional[ForecastResult] = None) -> Optional[str]:
+        """
+        Analyze a single market for trading opportunity.
+        
+        Args:
+            market: Market to analyze
+            forecast: Precomputed forecast (fetched here if not provided)
+        """
+        if forecast is None:
+            if not self.edge_detector.edge_is_reachable(market):
+                logger.info("⏭️ Skipping %s... (edge capped at $%.2f YES)", market.question[:50], market.yes_price)
+                return None
+            try:
+                forecast = self._forecast_market(market)
+            except Exception as e:
+                logger.error("Forecast failed for market %s: %s", market.id, e)
+                return None
+        
+        analysis = self._evaluate_market(market, forecast)
+        if analysis is None:
+            return None
+        return self._recommend_trade(analysis, self.position_sizer.calculate_position(analysis))
+    
+    def _evaluate_market(self, market: Market, forecast: ForecastResult) -> Optional[EdgeAnalysis]:
+        """
+        Turn a forecast into an edge analysis and track it for the summary.
+        
+        Returns:
+            The EdgeAnalysis if it meets the edge threshold, else None
+        """
+        logger.info("\n--- Analyzing: %s...", market.question[:60])
+        
+        try:
+            model_prob, outcome = forecast.probability, forecast.outcome
             
             # Check if AIs disagree (skip trade if so)
-            if self._last_forecast and self._last_forecast.should_skip:
-                logger.warning(f"⚠️ SKIPPING: AI disagreement on {market.question[:40]}...")
+            if forecast.should_skip:
+                logger.warning("⚠️ SKIPPING: AI disagreement on %s...", market.question[:40])
                 # Still track for summary but mark as skipped
                 self.analyzed_markets.append({
                     "question": market.question,
@@ -311,12 +566,12 @@ class ImprovedTrader:
                     "action": "AI_DISAGREE",
                     "url": market.market_url,
                     "slug": getattr(market, 'slug', None),
-                    "ai_agreement": self._last_forecast.agreement if self._last_forecast else 0
+                    "ai_agreement": forecast.agreement
                 })
                 return None
             
             if model_prob is None:
-                logger.warning(f"Could not parse LLM probability for market {market.id}")
+                logger.warning("Could not parse LLM probability for market %s", market.id)
                 # Use 50% as fallback (per FIXES_COMPLETE.md spec)
                 model_prob = 0.5
                 outcome = "Yes"
@@ -328,22 +583,20 @@ class ImprovedTrader:
             else:
                 yes_prob = model_prob
             
-            logger.info(f"Model forecast: {yes_prob*100:.1f}% YES, {(1-yes_prob)*100:.1f}% NO")
-            logger.info(f"Market prices: ${market.yes_price:.4f} YES, ${market.no_price:.4f} NO")
+            logger.info("Model forecast: %.1f%% YES, %.1f%% NO", yes_prob*100, (1-yes_prob)*100)
+            logger.info("Market prices: $%.4f YES, $%.4f NO", market.yes_price, market.no_price)
             
             # Detect edge
             analysis = self.edge_detector.analyze_edge(market, yes_prob)
-            logger.info(f"Edge analysis: {analysis.reason}")
+            logger.info("Edge analysis: %s", analysis.reason)
             
             # Track for summary
-            ai_info = {}
-            if self._last_forecast:
-                ai_info = {
-                    "ai_agreement": self._last_forecast.agreement,
-                    "ai_confidence": self._last_forecast.confidence,
-                    "gpt_prob": self._last_forecast.gpt_prob,
-                    "grok_prob": self._last_forecast.grok_prob,
-                }
+            ai_info = {
+                "ai_agreement": forecast.agreement,
+                "ai_confidence": forecast.confidence,
+                "gpt_prob": forecast.gpt_prob,
+                "grok_prob": forecast.grok_prob,
+            }
             
             self.analyzed_markets.append({
                 "question": market.question,
@@ -358,10 +611,19 @@ class ImprovedTrader:
             
             if not analysis.meets_threshold:
                 return None
+            return analysis
             
-            # Calculate position size
-            position = self.position_sizer.calculate_position(analysis)
-            logger.info(f"Position sizing: {position.reason}")
+        except Exception as e:
+            logger.error("Error analyzing market %s: %s", market.id, e)
+            import traceback
+            traceback.print_exc()
+            return None
+    
+    def _recommend_trade(self, analysis: EdgeAnalysis, position: PositionRecommendation) -> Optional[str]:
+        """Save and track a sized trade recommendation (returns the filename)"""
+        market = analysis.market
+        try:
+            logger.info("Position sizing: %s", position.reason)
             
             if not position.should_trade:
                 return None
@@ -375,7 +637,7 @@ class ImprovedTrader:
             
             # Save and return
             filename = self.recommendation_gen.save_recommendation(recommendation)
-            logger.info(f"✅ Trade recommended! Saved to: {filename}")
+            logger.info("✅ Trade recommended! Saved to: %s", filename)
             
             # Track position (but don't actually execute - user does manually)
             self.position_tracker.add_position(
@@ -391,34 +653,49 @@ class ImprovedTrader:
             return filename
             
         except Exception as e:
-            logger.error(f"Error analyzing market {market.id}: {e}")
+            logger.error("Error recommending trade for market %s: %s", market.id, e)
             import traceback
             traceback.print_exc()
             return None
     
     def _gather_context(self, question: str) -> str:
-        """Gather real-time context for forecasting"""
-        context = ""
+        """Gather real-time context for forecasting (cached on disk across runs)"""
+        cached = self.context_cache.get(question)
+        if cached is not None:
+            logger.info("Using cached real-time context")
+            return cached
+        
+        parts: List[str] = []
+        failed = False
+        
+        # Tavily and News lookups are independent - run them in parallel
+        search_future = CONTEXT_EXECUTOR.submit(tavily_client.get_search_context, query=question, max_results=5)
+        news_future = CONTEXT_EXECUTOR.submit(self.news.get_articles_for_options, [question])
         
         try:
-            search_results = tavily_client.get_search_context(query=question, max_results=5)
-            context += f"\n**Web Search:**\n{search_results}\n"
+            search_results = search_future.result(timeout=CONTEXT_LOOKUP_TIMEOUT)
+            parts.append(f"\n**Web Search:**\n{search_results}\n")
         except Exception as e:
             logger.warning(f"Tavily search failed: {e}")
+            failed = True
         
         try:
-            articles = self.news.get_articles_for_options([question])
+            articles = news_future.result(timeout=CONTEXT_LOOKUP_TIMEOUT)
             if articles:
-                context += "\n**Recent News:**\n"
+                parts.append("\n**Recent News:**\n")
                 for keyword, arts in articles.items():
                     for art in arts[:2]:
-                        context += f"- {art.get('title', '')}\n"
+                        parts.append(f"- {art.get('title', '')}\n")
         except Exception as e:
             logger.warning(f"News API failed: {e}")
+            failed = True
         
+        # Failed lookups are cached briefly so an outage isn't hammered
+        context = "".join(parts)
+        self.context_cache.set(question, context, CONTEXT_FAILURE_TTL if failed else CONTEXT_CACHE_TTL)
         return context
     
-    def _get_llm_forecast(self, market: Market, context: str) -> tuple:
+    def _get_llm_forecast(self, market: Market, context: str) -> ForecastResult:
         """Get probability forecast from dual AI (GPT-4o-mini + Grok)"""
         prompt = self.prompter.superforecaster(
             question=market.question,
@@ -439,23 +716,22 @@ class ImprovedTrader:
         # Log the dual AI result
         logger.info(f"📊 Dual AI: {result.reasoning}")
         
-        # Store the forecast result for later use
-        self._last_forecast = result
-        
-        return result.probability, result.outcome
+        return result
     
-    def _detect_bracket_strategies(self, markets: List[Market]):
-        """Detect and generate bracket strategies for related markets"""
+    def _detect_bracket_strategies(self, bracket_groups: Dict[str, List[BracketMarket]]):
+        """Generate bracket strategies for pre-grouped related markets"""
         try:
-            # Group markets by topic
-            bracket_groups = self.bracket_detector.group_related_markets(markets)
-            
             if not bracket_groups:
                 logger.info("No bracket market groups detected")
                 return
             
             logger.info(f"Found {len(bracket_groups)} potential bracket groups")
             
+            # Index analyzed markets by 30-char question prefix once (first match wins)
+            by_prefix = {}
+            for am in self.analyzed_markets:
+                by_prefix.setdefault(am.get('question', '')[:30], am)
+            
             for topic, brackets in bracket_groups.items():
                 logger.info(f"  - {topic}: {len(brackets)} brackets")
                 
@@ -463,10 +739,9 @@ class ImprovedTrader:
                 model_forecasts = {}
                 for bracket in brackets:
                     # Try to find matching analyzed market
-                    for am in self.analyzed_markets:
-                        if am.get('question', '').startswith(bracket.market.question[:30]):
-                            model_forecasts[bracket.bracket_label] = am.get('model_prob', bracket.yes_price)
-                            break
+                    match = self._find_analyzed_market(bracket.market.question[:30], by_prefix)
+                    if match is not None:
+                        model_forecasts[bracket.bracket_label] = match.get('model_prob', bracket.yes_price)
                 
                 # Generate strategy
                 strategy = self.bracket_generator.generate_strategy(topic, brackets, model_forecasts)
@@ -483,6 +758,16 @@ class ImprovedTrader:
             import traceback
             traceback.print_exc()
     
+    def _find_analyzed_market(self, prefix: str, by_prefix: Dict[str, Dict]) -> Optional[Dict]:
+        """Find the first analyzed market whose question starts with prefix"""
+        if len(prefix) == 30:
+            return by_prefix.get(prefix)
+        # Short questions: prefix is the whole question, so fall back to a scan
+        for am in self.analyzed_markets:
+            if am.get('question', '').startswith(prefix):
+                return am
+        return None
+    
     def _get_all_rejections(self) -> dict:
         """Combine all rejection reasons"""
         rejections = {}
@@ -492,11 +777,8 @@ class ImprovedTrader:
             rejections[f"API: {reason}"] = count
         
         # From filter
-        filter_reasons = {}
-        for item in self.market_filter.get_rejection_log():
-            reason = item["reason"].split(":")[0]
-            filter_reasons[f"Filter: {reason}"] = filter_reasons.get(f"Filter: {reason}", 0) + 1
-        rejections.update(filter_reasons)
+        for reason, count in self.market_filter.get_rejection_counts().items():
+            rejections[f"Filter: {reason}"] = count
         
         return rejections
 
@@ -542,10 +824,13 @@ Usage:
     print(f"{'='*100}")
     
     if trader.analyzed_markets:
+        # Build the table in one buffer and print it once
+        table = io.StringIO()
+        border = f"+{'-'*50}+{'-'*8}+{'-'*8}+{'-'*8}+{'-'*18}+\n"
         # Header
-        print(f"\n+{'-'*50}+{'-'*8}+{'-'*8}+{'-'*8}+{'-'*18}+")
-        print(f"| {'MARKET':<48} | {'MODEL':>6} | {'PRICE':>6} | {'EDGE':>6} | {'ACTION':<16} |")
-        print(f"+{'-'*50}+{'-'*8}+{'-'*8}+{'-'*8}+{'-'*18}+")
+        table.write("\n" + border)
+        table.write(f"| {'MARKET':<48} | {'MODEL':>6} | {'PRICE':>6} | {'EDGE':>6} | {'ACTION':<16} |\n")
+        table.write(border)
         
         for am in trader.analyzed_markets:
             action = am.get('action', 'NO_TRADE')
@@ -562,9 +847,10 @@ Usage:
                 marker = "   "
                 action_str = action
             
-            print(f"|{marker}{question:<47} | {model_pct:>5.0f}% | {market_pct:>5.0f}% | {edge:>+5.1f}% | {action_str:<16} |")
+            table.write(f"|{marker}{question:<47} | {model_pct:>5.0f}% | {market_pct:>5.0f}% | {edge:>+5.1f}% | {action_str:<16} |\n")
         
-        print(f"+{'-'*50}+{'-'*8}+{'-'*8}+{'-'*8}+{'-'*18}+")
+        table.write(border)
+        print(table.getvalue(), end="")
     
     # Show recommended trades with clickable links
     recommended = [am for am in trader.analyzed_markets if am.get('action') in ('BUY_YES', 'BUY_NO')]
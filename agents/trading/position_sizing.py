@@ -3,9 +3,11 @@ Position Sizing Module
 Safe position sizing based on bankroll and market characteristics.
 """
 import logging
-from typing import Optional
+from typing import List, Optional
 from dataclasses import dataclass
 
+import numpy as np
+
 from agents.trading.api_client import Market
 from agents.trading.edge_model import EdgeAnalysis, TradeAction
 
@@ -59,6 +61,17 @@ class PositionSizer:
         self.current_positions = current_positions
         self.deployed_capital = deployed_capital
         self.config = config or PositionConfig()
+        
+        # Bankroll and config are fixed for the sizer's lifetime - bind the
+        # sizing constants once instead of chasing config attributes per call
+        cfg = self.config
+        self._short_term_days = cfg.short_term_days
+        self._max_short_term_percent = cfg.max_short_term_percent
+        self._max_position_percent = cfg.max_position_percent
+        self._kelly_scale = cfg.kelly_fraction * 100
+        self._min_position_usd = cfg.min_position_usd
+        self._usd_per_percent = bankroll / 100
+        self._portfolio_block = self._portfolio_block_reason()
     
     def calculate_position(self, analysis: EdgeAnalysis) -> PositionRecommendation:
         """
@@ -70,6 +83,102 @@ class PositionSizer:
         Returns:
             PositionRecommendation with size and reasoning
         """
+        return self.calculate_positions_batch([analysis])[0]
+    
+    def calculate_positions_batch(self, analyses: List[EdgeAnalysis]) -> List[PositionRecommendation]:
+        """
+        Calculate recommended position sizes for several trades at once.
+        
+        Kelly sizing and expected ROI are computed as NumPy column operations
+        over every analysis that passes the threshold and portfolio checks.
+        
+        Args:
+            analyses: EdgeAnalysis results from edge detector
+            
+        Returns:
+            PositionRecommendation per analysis, in input order
+        """
+        results: List[Optional[PositionRecommendation]] = [None] * len(analyses)
+        sized = []  # Indices of analyses that get a Kelly size
+        for i, analysis in enumerate(analyses):
+            rejection = self._check_limits(analysis)
+            if rejection:
+                results[i] = rejection
+            else:
+                sized.append(i)
+        
+        if not sized:
+            return results
+        
+        candidates = [analyses[i] for i in sized]
+        n = len(candidates)
+        buy_yes = np.fromiter(
+            (a.recommended_action == TradeAction.BUY_YES for a in candidates), dtype=bool, count=n
+        )
+        yes_prob = np.fromiter((a.model_yes_prob for a in candidates), dtype=np.float64, count=n)
+        yes_price = np.fromiter((a.market_yes_price for a in candidates), dtype=np.float64, count=n)
+        no_price = np.fromiter((a.market_no_price for a in candidates), dtype=np.float64, count=n)
+        days = np.fromiter(
+            (a.market.days_to_resolution or 999 for a in candidates), dtype=np.float64, count=n
+        )
+        
+        # Win probability and entry price of the recommended side
+        win_prob = np.where(buy_yes, yes_prob, 1.0 - yes_prob)
+        entry_price = np.where(buy_yes, yes_price, no_price)
+        
+        # Determine max position based on time to resolution
+        short_term = days < self._short_term_days
+        max_position = np.where(short_term, self._max_short_term_percent, self._max_position_percent)
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Kelly formula: f* = (p * b - q) / b, where p = win prob, q = 1-p, b = odds
+            odds = np.where(entry_price > 0, 1.0 / entry_price - 1.0, 0.0)
+            kelly = np.where(
+                odds > 0,
+                np.maximum(0.0, (win_prob * odds - (1.0 - win_prob)) / odds) * self._kelly_scale,
+                0.0
+            )
+            # Expected ROI ($1 payout if win)
+            expected_roi = np.where(entry_price > 0, (win_prob - entry_price) / entry_price * 100, 0.0)
+        
+        # Take minimum of Kelly and max position
+        position_percent = np.minimum(kelly, max_position)
+        position_usd = position_percent * self._usd_per_percent
+        min_usd = self._min_position_usd
+        
+        for i, analysis, short, pct, usd, roi in zip(
+            sized, candidates, short_term.tolist(), position_percent.tolist(),
+            position_usd.tolist(), expected_roi.tolist()
+        ):
+            risk_level = "HIGH (short-term)" if short else "MODERATE"
+            
+            # Ensure minimum trade size
+            if usd < min_usd:
+                results[i] = PositionRecommendation(
+                    should_trade=False,
+                    position_percent=0,
+                    position_usd=0,
+                    reason=f"Position too small: ${usd:.2f} < ${min_usd:.2f} min",
+                    edge_percent=analysis.edge_percent,
+                    expected_roi=0,
+                    risk_level=risk_level
+                )
+                continue
+            
+            results[i] = PositionRecommendation(
+                should_trade=True,
+                position_percent=round(pct, 2),
+                position_usd=round(usd, 2),
+                reason=f"Edge {analysis.edge_percent:.1f}% detected on {analysis.recommended_action.value}",
+                edge_percent=analysis.edge_percent,
+                expected_roi=round(roi, 1),
+                risk_level=risk_level
+            )
+        
+        return results
+    
+    def _check_limits(self, analysis: EdgeAnalysis) -> Optional[PositionRecommendation]:
+        """Return a no-trade recommendation if the edge or portfolio limits block the trade"""
         # Check if we should trade at all
         if not analysis.meets_threshold:
             return PositionRecommendation(
@@ -82,94 +191,33 @@ class PositionSizer:
                 risk_level="N/A"
             )
         
-        # Check portfolio limits
-        if self.current_positions >= self.config.max_concurrent_positions:
+        # Check portfolio limits (precomputed - same for every analysis)
+        if self._portfolio_block:
             return PositionRecommendation(
                 should_trade=False,
                 position_percent=0,
                 position_usd=0,
-                reason=f"Max positions reached ({self.current_positions}/{self.config.max_concurrent_positions})",
+                reason=self._portfolio_block,
                 edge_percent=analysis.edge_percent,
                 expected_roi=0,
                 risk_level="N/A"
             )
         
+        return None
+    
+    def _portfolio_block_reason(self) -> Optional[str]:
+        """Reason the current portfolio state blocks new trades, or None"""
+        if self.current_positions >= self.config.max_concurrent_positions:
+            return f"Max positions reached ({self.current_positions}/{self.config.max_concurrent_positions})"
+        
         deployed_percent = (self.deployed_capital / self.bankroll) * 100 if self.bankroll > 0 else 100
         if deployed_percent >= self.config.max_deployed_capital:
-            return PositionRecommendation(
-                should_trade=False,
-                position_percent=0,
-                position_usd=0,
-                reason=f"Max capital deployed ({deployed_percent:.1f}% >= {self.config.max_deployed_capital}%)",
-                edge_percent=analysis.edge_percent,
-                expected_roi=0,
-                risk_level="N/A"
-            )
+            return f"Max capital deployed ({deployed_percent:.1f}% >= {self.config.max_deployed_capital}%)"
         
-        # Determine max position based on time to resolution
-        days = analysis.market.days_to_resolution or 999
-        if days < self.config.short_term_days:
-            max_position = self.config.max_short_term_percent
-            risk_level = "HIGH (short-term)"
-        else:
-            max_position = self.config.max_position_percent
-            risk_level = "MODERATE"
-        
-        # Calculate Kelly-optimal position (dampened)
-        edge = analysis.edge_percent / 100  # Convert to decimal
-        
-        if analysis.recommended_action == TradeAction.BUY_YES:
-            win_prob = analysis.model_yes_prob
-            odds = (1 / analysis.market_yes_price) - 1 if analysis.market_yes_price > 0 else 0
-        else:
-            win_prob = analysis.model_no_prob
-            odds = (1 / analysis.market_no_price) - 1 if analysis.market_no_price > 0 else 0
-        
-        # Kelly formula: f* = (p * b - q) / b, where p = win prob, q = 1-p, b = odds
-        if odds > 0:
-            kelly = ((win_prob * odds) - (1 - win_prob)) / odds
-            kelly = max(0, kelly) * self.config.kelly_fraction  # Dampened Kelly
-            kelly_percent = kelly * 100
-        else:
-            kelly_percent = 0
-        
-        # Take minimum of Kelly and max position
-        position_percent = min(kelly_percent, max_position)
-        
-        # Ensure minimum trade size
-        position_usd = (position_percent / 100) * self.bankroll
-        if position_usd < self.config.min_position_usd:
-            return PositionRecommendation(
-                should_trade=False,
-                position_percent=0,
-                position_usd=0,
-                reason=f"Position too small: ${position_usd:.2f} < ${self.config.min_position_usd:.2f} min",
-                edge_percent=analysis.edge_percent,
-                expected_roi=0,
-                risk_level=risk_level
-            )
-        
-        # Calculate expected ROI
-        if analysis.recommended_action == TradeAction.BUY_YES:
-            entry_price = analysis.market_yes_price
-            expected_payout = analysis.model_yes_prob * 1.0  # $1 payout if win
-        else:
-            entry_price = analysis.market_no_price
-            expected_payout = analysis.model_no_prob * 1.0
-        
-        expected_roi = ((expected_payout - entry_price) / entry_price) * 100 if entry_price > 0 else 0
-        
-        return PositionRecommendation(
-            should_trade=True,
-            position_percent=round(position_percent, 2),
-            position_usd=round(position_usd, 2),
-            reason=f"Edge {analysis.edge_percent:.1f}% detected on {analysis.recommended_action.value}",
-            edge_percent=analysis.edge_percent,
-            expected_roi=round(expected_roi, 1),
-            risk_level=risk_level
-        )
+        return None
     
     def update_portfolio_state(self, positions: int, deployed: float):
         """Update current portfolio state"""
         self.current_positions = positions
         self.deployed_capital = deployed
+        self._portfolio_block = self._portfolio_block_reason()
@@ -3,10 +3,19 @@ Recommendation Generator
 Produces clean, structured trade recommendations with table formatting.
 Supports near-miss output and manual check suggestions for EOY mode.
 """
+import io
+import itertools
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List, Dict
+from operator import itemgetter
+from typing import Optional, List, Dict, Tuple
 from pathlib import Path
+from urllib.parse import quote_plus
+
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache
+from markupsafe import Markup
 
 from agents.trading.api_client import Market
 from agents.trading.edge_model import EdgeAnalysis, TradeAction
@@ -23,94 +32,64 @@ except ImportError:
     BracketStrategy = None
 
 
-class RecommendationGenerator:
-    """
-    Generates clean, structured trade recommendations.
-    Includes market links and near-miss suggestions.
-    """
-    
-    def __init__(self, output_dir: str = "."):
-        self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(exist_ok=True)
-    
-    def generate(
-        self,
-        analysis: EdgeAnalysis,
-        position: PositionRecommendation,
-        bankroll: float
-    ) -> str:
-        """
-        Generate a complete trade recommendation.
-        
-        Returns:
-            Formatted recommendation string
-        """
-        market = analysis.market
-        action = analysis.recommended_action
-        
-        # Determine which outcome to trade
-        if action == TradeAction.BUY_YES:
-            outcome = "YES"
-            entry_price = market.yes_price
-            model_prob = analysis.model_yes_prob
-        elif action == TradeAction.BUY_NO:
-            outcome = "NO"
-            entry_price = market.no_price
-            model_prob = analysis.model_no_prob
-        else:
-            outcome = "N/A"
-            entry_price = 0
-            model_prob = 0
-        
-        # Format resolution date
-        if market.end_date:
-            resolution_date = market.end_date.strftime("%B %d, %Y")
-            days_left = market.days_to_resolution
-        else:
-            resolution_date = "Unknown"
-            days_left = "Unknown"
-        
-        recommendation = f"""================================================================================
+# ==============================================================================
+# TEXT RECOMMENDATION TEMPLATE
+# ==============================================================================
+# Parsed once at import; generate() fills it with a single format_map call
+_REC_TEMPLATE = """================================================================================
 POLYMARKET TRADE RECOMMENDATION
 ================================================================================
 
-Generated: {datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")} UTC
+Generated: {generated} UTC
 
 MARKET DETAILS
 --------------------------------------------------------------------------------
-Question: {market.question}
-Market Link: {market.market_url}
+Question: {question}
+Market Link: {market_url}
 Outcomes: Yes / No
-Current YES Price: ${market.yes_price:.4f}
-Current NO Price: ${market.no_price:.4f}
-Volume (24h): ${market.volume_24h:,.0f}
-Total Volume: ${market.volume:,.0f}
+Current YES Price: ${yes_price:.4f}
+Current NO Price: ${no_price:.4f}
+Volume (24h): ${volume_24h:,.0f}
+Total Volume: ${volume:,.0f}
 Resolution Date: {resolution_date} ({days_left} days)
 
 MODEL FORECAST
 --------------------------------------------------------------------------------
-Estimated probability of YES: {analysis.model_yes_prob * 100:.1f}%
-Estimated probability of NO: {analysis.model_no_prob * 100:.1f}%
-Confidence: {analysis.confidence.upper()}
+Estimated probability of YES: {model_yes_pct:.1f}%
+Estimated probability of NO: {model_no_pct:.1f}%
+Confidence: {confidence}
 
 EDGE ANALYSIS
 --------------------------------------------------------------------------------
-YES edge: {analysis.yes_edge:+.1f}%
-NO edge: {analysis.no_edge:+.1f}%
-Detected edge: {analysis.edge_percent:.1f}% on {outcome}
-Potential ROI: {analysis.potential_roi:.1f}%
-Required threshold: {"8.0% (short-term)" if days_left and days_left < 14 else "5.0%"} ({"MET ✓" if analysis.meets_threshold else "NOT MET ✗"})
+YES edge: {yes_edge:+.1f}%
+NO edge: {no_edge:+.1f}%
+Detected edge: {edge_percent:.1f}% on {outcome}
+Potential ROI: {potential_roi:.1f}%
+Required threshold: {required_threshold} ({threshold_status})
 
 TRADE RECOMMENDATION
 --------------------------------------------------------------------------------
-ACTION: {"BUY " + outcome if position.should_trade else "NO TRADE"}
-Target Entry Price: ${entry_price:.4f} (market order) / ${analysis.target_price:.4f} (limit order)
-Position Size: {position.position_percent:.1f}% of bankroll (≈ ${position.position_usd:.2f})
-Risk Level: {position.risk_level}
+ACTION: {action_line}
+Target Entry Price: ${entry_price:.4f} (market order) / ${target_price:.4f} (limit order)
+Position Size: {position_percent:.1f}% of bankroll (≈ ${position_usd:.2f})
+Risk Level: {risk_level}
+{sports_block}{cap_block}
+HOW TO EXECUTE ON POLYMARKET.COM
+--------------------------------------------------------------------------------
+1. Visit: {market_url}
+2. Click on the {outcome} outcome
+3. For market order: Buy at ${entry_price:.4f}
+4. For limit order: Set limit price at ${target_price:.4f} (2% discount)
+5. Enter amount: ${position_usd:.2f}
+6. Review and confirm
+
+================================================================================
+⚠️ This is automated analysis. Always verify and use your judgment.
+Past performance does not guarantee future results. Trade at your own risk.
+================================================================================
 """
-        # Add sports warning if applicable
-        if analysis.is_sports:
-            recommendation += """
+
+_SPORTS_WARNING_BLOCK = """
 ⚠️ SPORTS MARKET WARNING
 --------------------------------------------------------------------------------
 This is a sports market. Sports predictions are notoriously difficult and 
@@ -120,100 +99,21 @@ our model may be miscalibrated. Consider:
 - Verifying with external sports analysis
 --------------------------------------------------------------------------------
 """
-        
-        # Add cap warning if model was adjusted
-        if analysis.was_capped:
-            recommendation += f"""
+
+_CAP_NOTE_TEMPLATE = """
 ℹ️ MODEL ADJUSTMENT APPLIED
 --------------------------------------------------------------------------------
-{analysis.cap_reason}
+{cap_reason}
 Original model output was adjusted to prevent overconfident predictions.
 --------------------------------------------------------------------------------
 """
 
-        recommendation += f"""
-HOW TO EXECUTE ON POLYMARKET.COM
---------------------------------------------------------------------------------
-1. Visit: {market.market_url}
-2. Click on the {outcome} outcome
-3. For market order: Buy at ${entry_price:.4f}
-4. For limit order: Set limit price at ${analysis.target_price:.4f} (2% discount)
-5. Enter amount: ${position.position_usd:.2f}
-6. Review and confirm
-
-================================================================================
-⚠️ This is automated analysis. Always verify and use your judgment.
-Past performance does not guarantee future results. Trade at your own risk.
-================================================================================
-"""
-        return recommendation
-    
-    def generate_no_trade(self, reason: str, near_misses: List[Dict] = None) -> str:
-        """Generate a no-trade recommendation with reason and near-miss suggestions"""
-        output = f"""================================================================================
-POLYMARKET ANALYSIS - NO TRADE RECOMMENDED
-================================================================================
-
-Generated: {datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")} UTC
-
-RECOMMENDATION: NO TRADE
-
-Reason: {reason}
-
-"""
-        # Add near-miss suggestions if available
-        if near_misses and len(near_misses) > 0:
-            output += """
-NO STRONG RECOMMENDATIONS, BUT CHECK THESE MANUALLY:
---------------------------------------------------------------------------------
-These markets almost passed our filters and may be worth a look:
-
-"""
-            for i, nm in enumerate(near_misses[:5], 1):
-                category = nm.get('category', 'Other') or 'Other'
-                output += f"""{i}. {nm.get('question', 'Unknown')}
-   Volume: ${nm.get('volume', 0):,.0f} | 24h: ${nm.get('volume_24h', 0):,.0f}
-   Days to resolution: {nm.get('days_to_resolution', '?')}
-   Prices: Yes ${nm.get('prices', [0,0])[0]:.2f} / No ${nm.get('prices', [0,0])[1] if len(nm.get('prices', [])) > 1 else 0:.2f}
-   Category: {category}
-   Why filtered: {nm.get('reason', 'Unknown')}
-   Near-miss score: {nm.get('score', 0):.0f}/100
 
-"""
-        
-        output += """================================================================================
-"""
-        return output
-    
-    def save_recommendation(
-        self,
-        recommendation: str,
-        prefix: str = "trade_rec"
-    ) -> str:
-        """Save recommendation to file and return filename"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = self.output_dir / f"{prefix}_{timestamp}.txt"
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(recommendation)
-        
-        logger.info(f"Recommendation saved to: {filename}")
-        return str(filename)
-    
-    def save_html(self, html_content: str, prefix: str = "report") -> str:
-        """Save HTML report to file"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = self.output_dir / f"{prefix}_{timestamp}.html"
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        logger.info(f"HTML report saved to: {filename}")
-        return str(filename)
-    
-    def _get_html_styles(self) -> str:
-        """Return CSS styles for HTML reports - clean professional design"""
-        return """
+# ==============================================================================
+# HTML SUMMARY TEMPLATE
+# ==============================================================================
+# Static CSS for HTML reports - clean professional design
+_HTML_STYLES: str = """
         <style>
             * { box-sizing: border-box; margin: 0; padding: 0; }
             
@@ -455,193 +355,76 @@ These markets almost passed our filters and may be worth a look:
             }
         </style>
         """
-    
-    def generate_html_summary(
-        self,
-        markets_scanned: int,
-        markets_valid: int,
-        trades_recommended: int,
-        rejections_by_reason: dict,
-        near_misses: List[Dict] = None,
-        analyzed_markets: List[Dict] = None,
-        bracket_strategies: List = None
-    ) -> str:
-        """Generate beautiful HTML daily summary report"""
-        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
-        
-        # Calculate hit rate
-        hit_rate = (trades_recommended / markets_valid * 100) if markets_valid > 0 else 0
-        
-        # Build rejection breakdown HTML
-        rejections_html = ""
-        for reason, count in sorted(rejections_by_reason.items(), key=lambda x: -x[1]):
-            rejections_html += f'<tr><td>{reason}</td><td style="text-align:right">{count}</td></tr>'
-        
-        # Build analyzed markets table
-        markets_html = ""
-        if analyzed_markets:
-            for am in analyzed_markets[:15]:
-                action = am.get('action', 'NO_TRADE')
-                question = am.get('question', 'Unknown')
-                model_pct = am.get('model_prob', 0) * 100
-                market_pct = am.get('market_price', 0) * 100
-                edge = am.get('edge', 0)
-                url = am.get('url', '#')
-                
-                is_trade = action in ('BUY_YES', 'BUY_NO')
-                row_class = 'trade-row' if is_trade else ''
-                
-                # Edge coloring
-                edge_class = 'edge-positive' if edge > 0 else 'edge-negative' if edge < 0 else ''
-                
-                # Action badge
-                if action == 'BUY_YES':
-                    badge = '<span class="badge badge-success">BUY YES</span>'
-                elif action == 'BUY_NO':
-                    badge = '<span class="badge badge-success">BUY NO</span>'
-                else:
-                    badge = '<span class="badge badge-neutral">NO TRADE</span>'
-                
-                # Link for trades
-                link_html = f'<a href="{url}" target="_blank" class="trade-link">Trade Now →</a>' if is_trade else f'<a href="{url}" target="_blank" class="link-secondary">View</a>'
-                
-                markets_html += f'''
-                <tr class="{row_class}">
-                    <td><strong>{question[:60]}{"..." if len(question) > 60 else ""}</strong></td>
-                    <td style="text-align:center">{model_pct:.0f}%</td>
-                    <td style="text-align:center">{market_pct:.0f}%</td>
-                    <td style="text-align:center" class="{edge_class}">{edge:+.1f}%</td>
-                    <td style="text-align:center">{badge}</td>
-                    <td style="text-align:center">{link_html}</td>
-                </tr>'''
-        
-        # Build recommended trades section
-        recommended = [am for am in (analyzed_markets or []) if am.get('action') in ('BUY_YES', 'BUY_NO')]
-        recommended_html = ""
-        if recommended:
-            for i, am in enumerate(recommended, 1):
-                url = am.get('url', '#')
-                edge = am.get('edge', 0)
-                model_pct = am.get('model_prob', 0) * 100
-                market_pct = am.get('market_price', 0) * 100
-                action = am.get('action', 'BUY_YES')
-                
-                recommended_html += f'''
-                <div class="trade-card">
-                    <h3>#{i} {am.get('question', 'Unknown')}</h3>
-                    <div class="trade-details">
-                        <div class="trade-detail">
-                            <div class="label">Action</div>
-                            <div class="value" style="color: #34d399">{action.replace('_', ' ')}</div>
-                        </div>
-                        <div class="trade-detail">
-                            <div class="label">Edge</div>
-                            <div class="value edge-positive">{edge:+.1f}%</div>
-                        </div>
-                        <div class="trade-detail">
-                            <div class="label">Model</div>
-                            <div class="value">{model_pct:.0f}%</div>
-                        </div>
-                        <div class="trade-detail">
-                            <div class="label">Market</div>
-                            <div class="value">{market_pct:.0f}%</div>
-                        </div>
-                    </div>
-                    <a href="{url}" target="_blank" class="big-trade-btn">Trade on Polymarket →</a>
-                </div>'''
-        
-        # Build near-misses section
-        near_misses_html = ""
-        if near_misses:
-            for nm in near_misses[:5]:
-                question = nm.get('question', 'Unknown')
-                vol = nm.get('volume', 0)
-                reason = nm.get('reason', 'Unknown')
-                # Use actual URL from API, fallback to polymarket search
-                url = nm.get('url', '') or f"https://polymarket.com/markets?_q={question[:30].replace(' ', '+')}"
-                
-                near_misses_html += f'''
-                <div class="near-miss-card">
-                    <strong>{question}</strong>
-                    <div style="font-size: 12px; color: #666; margin-top: 5px">
-                        Volume: ${vol:,.0f} | {reason}
-                    </div>
-                    <div style="margin-top: 8px">
-                        <a href="{url}" target="_blank" class="link-secondary">View on Polymarket →</a>
-                    </div>
-                </div>'''
-        
-        # Build recommended trades section HTML
-        recommended_section_html = ""
-        if recommended:
-            recommended_section_html = f'''
-        <div class="recommended-section">
-            <div class="section-title"><span class="icon">🎯</span> Recommended Trades</div>
-            {recommended_html}
-        </div>
-        '''
-        
-        # Build near-misses section HTML
-        near_misses_section_html = ""
-        if near_misses:
-            near_misses_section_html = f'''
-        <div class="section">
-            <div class="section-title"><span class="icon">👀</span> Near-Miss Markets (Review Manually)</div>
-            <p style="color: var(--gray); margin-bottom: 1rem">These high-volume markets almost passed filters:</p>
-            {near_misses_html}
-        </div>
-        '''
-        
-        # Build bracket strategies HTML
-        bracket_section_html = ""
-        if bracket_strategies and BRACKET_SUPPORT:
-            generator = BracketStrategyGenerator()
-            bracket_css = generator.get_bracket_css()
-            for strategy in bracket_strategies:
-                bracket_section_html += generator.format_strategy_html(strategy)
-        else:
-            bracket_css = ""
-        
-        # Assemble full HTML
-        html = f'''<!DOCTYPE html>
+
+_SUMMARY_TEMPLATE_SRC = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Polymarket Trading Report - {datetime.now().strftime("%Y-%m-%d")}</title>
-    {self._get_html_styles()}
-    <style>{bracket_css}</style>
+    <title>Polymarket Trading Report - {{ report_date }}</title>
+    {{ styles }}
+    {% if bracket_css %}
+    <style>{{ bracket_css }}</style>
+    {% endif %}
 </head>
 <body>
     <div class="container">
         <div class="header">
             <h1>📊 Polymarket Trading Report</h1>
-            <div class="subtitle">Generated: {timestamp}</div>
+            <div class="subtitle">Generated: {{ timestamp }}</div>
         </div>
         
         <div class="stats-grid">
             <div class="stat-card">
-                <div class="value">{markets_scanned}</div>
+                <div class="value">{{ stats.markets_scanned }}</div>
                 <div class="label">Markets Scanned</div>
             </div>
             <div class="stat-card">
-                <div class="value">{markets_valid}</div>
+                <div class="value">{{ stats.markets_valid }}</div>
                 <div class="label">Passed Filters</div>
             </div>
             <div class="stat-card">
-                <div class="value">{trades_recommended}</div>
+                <div class="value">{{ stats.trades_recommended }}</div>
                 <div class="label">Trades Recommended</div>
             </div>
             <div class="stat-card">
-                <div class="value">{hit_rate:.1f}%</div>
+                <div class="value">{{ "%.1f"|format(stats.hit_rate) }}%</div>
                 <div class="label">Hit Rate</div>
             </div>
         </div>
         
-        {bracket_section_html}
-        
-        {recommended_section_html}
-        
+        {% if bracket_section_html %}
+        {{ bracket_section_html }}
+        {% endif %}
+        {% if recommended %}
+        <div class="recommended-section">
+            <div class="section-title"><span class="icon">🎯</span> Recommended Trades</div>
+            {% for am in recommended %}
+                <div class="trade-card">
+                    <h3>#{{ loop.index }} {{ am['question'] }}</h3>
+                    <div class="trade-details">
+                        <div class="trade-detail">
+                            <div class="label">Action</div>
+                            <div class="value" style="color: #34d399">{{ am['action']|replace('_', ' ') }}</div>
+                        </div>
+                        <div class="trade-detail">
+                            <div class="label">Edge</div>
+                            <div class="value edge-positive">{{ "%+.1f"|format(am['edge']) }}%</div>
+                        </div>
+                        <div class="trade-detail">
+                            <div class="label">Model</div>
+                            <div class="value">{{ "%.0f"|format(am['model_prob'] * 100) }}%</div>
+                        </div>
+                        <div class="trade-detail">
+                            <div class="label">Market</div>
+                            <div class="value">{{ "%.0f"|format(am['market_price'] * 100) }}%</div>
+                        </div>
+                    </div>
+                    <a href="{{ am['url'] or '#' }}" target="_blank" class="big-trade-btn">Trade on Polymarket →</a>
+                </div>
+            {% endfor %}
+        </div>
+        {% endif %}
         <div class="section">
             <div class="section-title"><span class="icon">📈</span> All Analyzed Markets</div>
             <table>
@@ -656,7 +439,21 @@ These markets almost passed our filters and may be worth a look:
                     </tr>
                 </thead>
                 <tbody>
-                    {markets_html}
+                    {% for am in analyzed_markets %}
+                    {% set action = am['action'] %}
+                    {% set question = am['question'] %}
+                    {% set edge = am['edge'] %}
+                    {% set url = am['url'] or '#' %}
+                    {% set is_trade = action in ('BUY_YES', 'BUY_NO') %}
+                <tr class="{{ 'trade-row' if is_trade else '' }}">
+                    <td><strong>{{ question|trunc }}</strong></td>
+                    <td style="text-align:center">{{ "%.0f"|format(am['model_prob'] * 100) }}%</td>
+                    <td style="text-align:center">{{ "%.0f"|format(am['market_price'] * 100) }}%</td>
+                    <td style="text-align:center" class="{{ edge|edge_class }}">{{ "%+.1f"|format(edge) }}%</td>
+                    <td style="text-align:center">{{ action|badge }}</td>
+                    <td style="text-align:center"><a href="{{ url }}" target="_blank" class="{{ 'trade-link' if is_trade else 'link-secondary' }}">{{ 'Trade Now →' if is_trade else 'View' }}</a></td>
+                </tr>
+                    {% endfor %}
                 </tbody>
             </table>
         </div>
@@ -668,13 +465,30 @@ These markets almost passed our filters and may be worth a look:
                     <tr><th>Reason</th><th style="text-align:right">Count</th></tr>
                 </thead>
                 <tbody>
-                    {rejections_html}
+                    {% for reason, count in stats.rejections_sorted %}
+                    <tr><td>{{ reason }}</td><td style="text-align:right">{{ count }}</td></tr>
+                    {% endfor %}
                 </tbody>
             </table>
         </div>
-        
-        {near_misses_section_html}
-        
+        {% if near_misses %}
+        <div class="section">
+            <div class="section-title"><span class="icon">👀</span> Near-Miss Markets (Review Manually)</div>
+            <p style="color: var(--gray); margin-bottom: 1rem">These high-volume markets almost passed filters:</p>
+            {% for nm in near_misses %}
+            {% set question = nm.get('question', 'Unknown') %}
+                <div class="near-miss-card">
+                    <strong>{{ question }}</strong>
+                    <div style="font-size: 12px; color: #666; margin-top: 5px">
+                        Volume: ${{ nm.get('volume', 0)|thousands }} | {{ nm.get('reason', 'Unknown') }}
+                    </div>
+                    <div style="margin-top: 8px">
+                        <a href="{{ nm|near_miss_url }}" target="_blank" class="link-secondary">View on Polymarket →</a>
+                    </div>
+                </div>
+            {% endfor %}
+        </div>
+        {% endif %}
         <div class="footer">
             <p>⚠️ This is automated analysis. Always verify and use your judgment.</p>
             <p>Past performance does not guarantee future results. Trade at your own risk.</p>
@@ -685,21 +499,423 @@ These markets almost passed our filters and may be worth a look:
     </div>
 </body>
 </html>'''
-        
-        return html
+
+# Large enough that a full report is written with a single flush
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Action badges for the analyzed-markets table (anything else is NO TRADE)
+_BADGE = {
+    'BUY_YES': Markup('<span class="badge badge-success">BUY YES</span>'),
+    'BUY_NO': Markup('<span class="badge badge-success">BUY NO</span>'),
+}
+_DEFAULT_BADGE = Markup('<span class="badge badge-neutral">NO TRADE</span>')
+
+
+def _edge_class(edge: float) -> str:
+    """CSS class coloring an edge value by sign"""
+    return 'edge-positive' if edge > 0 else 'edge-negative' if edge < 0 else ''
+
+
+SUMMARY_TEMPLATE_NAME = "daily_summary.html"
+TEMPLATE_CACHE_DIR = ".jinja_cache"
+
+
+def _make_template_env(cache_dir: Path) -> Environment:
+    """
+    Template environment with an on-disk bytecode cache.
     
-    def generate_daily_summary(
-        self,
+    Compiled templates persist under cache_dir, so later runs load bytecode
+    instead of recompiling. Autoescape covers market questions and URLs.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    env = Environment(
+        loader=DictLoader({SUMMARY_TEMPLATE_NAME: _SUMMARY_TEMPLATE_SRC}),
+        bytecode_cache=FileSystemBytecodeCache(directory=str(cache_dir)),
+        autoescape=True,
+        trim_blocks=True,     # Skipped sections leave no blank lines behind
+        lstrip_blocks=True,
+        auto_reload=False,
+        cache_size=400
+    )
+    env.filters['edge_class'] = _edge_class
+    env.filters['badge'] = lambda action: _BADGE.get(action, _DEFAULT_BADGE)
+    env.filters['thousands'] = lambda v: f"{v:,.0f}"
+    env.filters['near_miss_url'] = _near_miss_url
+    env.filters['trunc'] = _trunc
+    env.globals['styles'] = Markup(_HTML_STYLES)
+    return env
+
+
+# Analyzed-market row fields and the defaults reports fall back to
+_ROW_DEFAULTS = {
+    'action': 'NO_TRADE',
+    'question': 'Unknown',
+    'model_prob': 0,
+    'market_price': 0,
+    'edge': 0,
+    'url': '',
+}
+_ROW_FIELDS = itemgetter('action', 'question', 'model_prob', 'market_price', 'edge', 'url')
+
+
+def _normalize_rows(analyzed_markets: Optional[List[Dict]]) -> List[Dict]:
+    """Fill in missing row fields once so report loops can index instead of chaining .get()"""
+    return [{**_ROW_DEFAULTS, **am} for am in analyzed_markets or []]
+
+
+def _trunc(s: str, n: int = 60) -> str:
+    """Cut s to at most n characters, marking the cut with a single ellipsis"""
+    return s if len(s) <= n else s[:n - 1] + '…'
+
+
+# Text summary table rows, formatted from precompiled format strings
+_SUMMARY_ROW_FMT = "|{}{:<47} | {:>5.0f}% | {:>5.0f}% | {:>+5.1f}% | {:<13} |\n".format
+_NEAR_MISS_ROW_FMT = "| {:<68} | ${:>12,.0f} | {:<10} |\n".format
+
+
+_NO_TRADE_NEAR_MISS_FMT = """{i}. {question}
+   Volume: ${volume:,.0f} | 24h: ${volume_24h:,.0f}
+   Days to resolution: {days}
+   Prices: Yes ${yes_price:.2f} / No ${no_price:.2f}
+   Category: {category}
+   Why filtered: {reason}
+   Near-miss score: {score:.0f}/100
+
+""".format
+
+
+def _summary_row(row: Dict) -> str:
+    """Analyzed-markets table row; recommended trades are highlighted"""
+    action, question, model_prob, market_price, edge, _url = _ROW_FIELDS(row)
+    if action in ('BUY_YES', 'BUY_NO'):
+        marker, action = ">>>", f"*** {action} ***"
+    else:
+        marker = "   "
+    return _SUMMARY_ROW_FMT(marker, _trunc(question, 47), model_prob * 100, market_price * 100, edge, action)
+
+
+def _near_miss_row(nm: Dict) -> str:
+    """Near-miss table row: question, total volume and short rejection reason"""
+    return _NEAR_MISS_ROW_FMT(
+        _trunc(nm.get('question', 'Unknown'), 67),
+        nm.get('volume', 0),
+        nm.get('reason', 'Unknown')[:30].split(':')[0]
+    )
+
+
+POLYMARKET_SEARCH_URL = "https://polymarket.com/markets?_q="
+
+
+def _near_miss_url(nm: Dict) -> str:
+    """Market URL from the API, falling back to a Polymarket search on the question"""
+    return nm.get('url', '') or POLYMARKET_SEARCH_URL + quote_plus(nm.get('question', 'Unknown')[:30])
+
+
+def _file_timestamp() -> str:
+    """Local-time filename timestamp (YYYYmmdd_HHMMSS)"""
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+# Process-wide save counter: batched recommendations are saved within the
+# same second, so the timestamp alone does not give each file its own name
+_file_seq = itertools.count(1)
+
+
+def _report_filename(prefix: str, suffix: str) -> str:
+    """Unique report filename: <prefix>_<YYYYmmdd_HHMMSS>_<seq><suffix>"""
+    return f"{prefix}_{_file_timestamp()}_{next(_file_seq):03d}{suffix}"
+
+
+@dataclass(frozen=True)
+class ReportStats:
+    """Run statistics shared by the text and HTML summaries"""
+    markets_scanned: int
+    markets_valid: int
+    trades_recommended: int
+    hit_rate: float                                # Trades per valid market (%)
+    rejections_sorted: Tuple[Tuple[str, int], ...]  # (reason, count), most frequent first
+    
+    @classmethod
+    def from_counts(
+        cls,
         markets_scanned: int,
         markets_valid: int,
         trades_recommended: int,
-        rejections_by_reason: dict,
+        rejections_by_reason: dict
+    ) -> "ReportStats":
+        """Derive hit rate and the sorted rejection breakdown once per run"""
+        return cls(
+            markets_scanned=markets_scanned,
+            markets_valid=markets_valid,
+            trades_recommended=trades_recommended,
+            hit_rate=(trades_recommended / markets_valid * 100) if markets_valid > 0 else 0,
+            rejections_sorted=tuple(sorted(rejections_by_reason.items(), key=itemgetter(1), reverse=True))
+        )
+
+
+@dataclass(frozen=True)
+class ReportInputs:
+    """Market rows shared by the text and HTML summaries"""
+    top_markets: List[Dict]    # First 15 analyzed markets, missing fields filled in
+    near_misses: List[Dict]    # Top 8 near-misses
+    recommended: List[Dict]    # Analyzed markets with a BUY_YES / BUY_NO action
+    
+    @classmethod
+    def from_markets(
+        cls,
+        analyzed_markets: Optional[List[Dict]],
+        near_misses: Optional[List[Dict]]
+    ) -> "ReportInputs":
+        """Snapshot the report rows once per run (later appends are not seen)"""
+        rows = _normalize_rows(analyzed_markets)
+        return cls(
+            top_markets=rows[:15],
+            near_misses=(near_misses or [])[:8],
+            recommended=[row for row in rows if row['action'] in ('BUY_YES', 'BUY_NO')],
+        )
+
+
+class RecommendationGenerator:
+    """
+    Generates clean, structured trade recommendations.
+    Includes market links and near-miss suggestions.
+    """
+    
+    def __init__(self, output_dir: str = "."):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(exist_ok=True)
+        self._template_env = _make_template_env(self.output_dir / TEMPLATE_CACHE_DIR)
+        self._bracket_gen = None  # Created on first bracket report
+        self._bracket_css: Optional[Markup] = None
+        
+        # Background writer for save_recommendation; the executor's own exit
+        # hook finishes queued writes, await_writes() reports their outcome
+        self._write_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="report-write")
+        self._pending_writes: List[Tuple[str, Future]] = []  # (filename, write future)
+    
+    @property
+    def _bracket_generator(self) -> "BracketStrategyGenerator":
+        """Shared bracket strategy formatter, created on first use"""
+        if self._bracket_gen is None:
+            self._bracket_gen = BracketStrategyGenerator()
+            self._bracket_css = Markup(self._bracket_gen.get_bracket_css())
+        return self._bracket_gen
+    
+    def generate(
+        self,
+        analysis: EdgeAnalysis,
+        position: PositionRecommendation,
+        bankroll: float
+    ) -> str:
+        """
+        Generate a complete trade recommendation.
+        
+        Returns:
+            Formatted recommendation string
+        """
+        market = analysis.market
+        action = analysis.recommended_action
+        
+        # Determine which outcome to trade
+        if action == TradeAction.BUY_YES:
+            outcome = "YES"
+            entry_price = market.yes_price
+            model_prob = analysis.model_yes_prob
+        elif action == TradeAction.BUY_NO:
+            outcome = "NO"
+            entry_price = market.no_price
+            model_prob = analysis.model_no_prob
+        else:
+            outcome = "N/A"
+            entry_price = 0
+            model_prob = 0
+        
+        # Format resolution date
+        if market.end_date:
+            resolution_date = market.end_date.strftime("%B %d, %Y")
+            days_left = market.days_to_resolution
+        else:
+            resolution_date = "Unknown"
+            days_left = "Unknown"
+        
+        ctx = {
+            "generated": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+            "question": market.question,
+            "market_url": market.market_url,
+            "yes_price": market.yes_price,
+            "no_price": market.no_price,
+            "volume_24h": market.volume_24h,
+            "volume": market.volume,
+            "resolution_date": resolution_date,
+            "days_left": days_left,
+            "model_yes_pct": analysis.model_yes_prob * 100,
+            "model_no_pct": analysis.model_no_prob * 100,
+            "confidence": analysis.confidence.upper(),
+            "yes_edge": analysis.yes_edge,
+            "no_edge": analysis.no_edge,
+            "edge_percent": analysis.edge_percent,
+            "outcome": outcome,
+            "potential_roi": analysis.potential_roi,
+            "required_threshold": "8.0% (short-term)" if days_left and days_left < 14 else "5.0%",
+            "threshold_status": "MET ✓" if analysis.meets_threshold else "NOT MET ✗",
+            "action_line": "BUY " + outcome if position.should_trade else "NO TRADE",
+            "entry_price": entry_price,
+            "target_price": analysis.target_price,
+            "position_percent": position.position_percent,
+            "position_usd": position.position_usd,
+            "risk_level": position.risk_level,
+            # Optional warning blocks
+            "sports_block": _SPORTS_WARNING_BLOCK if analysis.is_sports else "",
+            "cap_block": _CAP_NOTE_TEMPLATE.format(cap_reason=analysis.cap_reason) if analysis.was_capped else "",
+        }
+        return _REC_TEMPLATE.format_map(ctx)
+    
+    def generate_no_trade(self, reason: str, near_misses: List[Dict] = None) -> str:
+        """Generate a no-trade recommendation with reason and near-miss suggestions"""
+        parts = [f"""================================================================================
+POLYMARKET ANALYSIS - NO TRADE RECOMMENDED
+================================================================================
+
+Generated: {datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")} UTC
+
+RECOMMENDATION: NO TRADE
+
+Reason: {reason}
+
+"""]
+        # Add near-miss suggestions if available
+        if near_misses and len(near_misses) > 0:
+            parts.append("""
+NO STRONG RECOMMENDATIONS, BUT CHECK THESE MANUALLY:
+--------------------------------------------------------------------------------
+These markets almost passed our filters and may be worth a look:
+
+""")
+            for i, nm in enumerate(near_misses[:5], 1):
+                prices = nm.get('prices') or [0, 0]
+                parts.append(_NO_TRADE_NEAR_MISS_FMT(
+                    i=i,
+                    question=nm.get('question', 'Unknown'),
+                    volume=nm.get('volume', 0),
+                    volume_24h=nm.get('volume_24h', 0),
+                    days=nm.get('days_to_resolution', '?'),
+                    yes_price=prices[0],
+                    no_price=prices[1] if len(prices) > 1 else 0,
+                    category=nm.get('category', 'Other') or 'Other',
+                    reason=nm.get('reason', 'Unknown'),
+                    score=nm.get('score', 0)
+                ))
+        
+        parts.append("""================================================================================
+""")
+        return "".join(parts)
+    
+    def save_recommendation(
+        self,
+        recommendation: str,
+        prefix: str = "trade_rec"
+    ) -> str:
+        """Save recommendation to file and return filename"""
+        filename = self.output_dir / _report_filename(prefix, ".txt")
+        
+        # Written in the background so a slow (network) output dir doesn't
+        # block analysis - call await_writes() before reading the file
+        future = self._write_pool.submit(self._do_write, filename, recommendation)
+        self._pending_writes.append((str(filename), future))
+        return str(filename)
+    
+    def _do_write(self, filename: Path, recommendation: str):
+        """Write one recommendation file (runs on the write pool; errors reach the future)"""
+        with open(filename, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(recommendation)
+        logger.info(f"Recommendation saved to: {filename}")
+    
+    def await_writes(self) -> List[str]:
+        """
+        Block until every queued recommendation file has been written.
+        
+        Returns:
+            Filenames whose write failed (already logged)
+        """
+        pending, self._pending_writes = self._pending_writes, []
+        failed = []
+        for filename, future in pending:
+            try:
+                future.result()
+            except OSError as e:
+                logger.error(f"Failed to save recommendation {filename}: {e}")
+                failed.append(filename)
+        return failed
+    
+    def save_html(self, html_content: str, prefix: str = "report") -> str:
+        """Save HTML report to file"""
+        filename = self.output_dir / _report_filename(prefix, ".html")
+        
+        with open(filename, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(html_content)
+        
+        logger.info(f"HTML report saved to: {filename}")
+        return str(filename)
+    
+    def _get_html_styles(self) -> str:
+        """Return CSS styles for HTML reports - clean professional design"""
+        return _HTML_STYLES
+    
+    def generate_html_summary(
+        self,
+        stats: "ReportStats",
+        near_misses: List[Dict] = None,
+        analyzed_markets: List[Dict] = None,
+        bracket_strategies: List = None,
+        inputs: Optional["ReportInputs"] = None
+    ) -> str:
+        """
+        Generate beautiful HTML daily summary report.
+        
+        Pass inputs to reuse rows already prepared for the text summary.
+        """
+        if inputs is None:
+            inputs = ReportInputs.from_markets(analyzed_markets, near_misses)
+        now = datetime.utcnow()  # One clock read for header and title
+        
+        # Bracket strategies render their own HTML/CSS
+        bracket_section_html = ""
+        bracket_css = ""
+        # Nothing bracket-related is built (or emitted) without strategies
+        if bracket_strategies and BRACKET_SUPPORT:
+            generator = self._bracket_generator
+            bracket_css = self._bracket_css
+            bracket_section_html = "".join(generator.format_strategy_html(s) for s in bracket_strategies)
+        
+        template = self._template_env.get_template(SUMMARY_TEMPLATE_NAME)
+        return template.render(
+            timestamp=now.strftime("%Y-%m-%d %H:%M:%S UTC"),
+            report_date=now.date().isoformat(),
+            bracket_css=bracket_css,
+            bracket_section_html=Markup(bracket_section_html),
+            stats=stats,
+            analyzed_markets=inputs.top_markets,
+            recommended=inputs.recommended,
+            near_misses=inputs.near_misses[:5],
+        )
+    
+    def generate_daily_summary(
+        self,
+        stats: "ReportStats",
         near_misses: List[Dict] = None,
         analyzed_markets: List[Dict] = None,
-        bracket_strategies: List = None
+        bracket_strategies: List = None,
+        inputs: Optional["ReportInputs"] = None
     ) -> str:
-        """Generate daily summary report with tables and highlighted recommendations"""
-        summary = f"""
+        """
+        Generate daily summary report with tables and highlighted recommendations.
+        
+        Pass inputs to reuse rows already prepared for the HTML summary.
+        """
+        if inputs is None:
+            inputs = ReportInputs.from_markets(analyzed_markets, near_misses)
+        buf = io.StringIO()
+        buf.write(f"""
 {'='*100}
                               POLYMARKET DAILY TRADING SUMMARY
 {'='*100}
@@ -709,26 +925,27 @@ Generated: {datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")} UTC
 +-------------------------+----------------+
 | SCAN RESULTS            |                |
 +-------------------------+----------------+
-| Markets scanned         | {markets_scanned:>14} |
-| Markets passing filters | {markets_valid:>14} |
-| Trades recommended      | {trades_recommended:>14} |
-| Hit rate                | {(trades_recommended / markets_valid * 100) if markets_valid > 0 else 0:>13.1f}% |
+| Markets scanned         | {stats.markets_scanned:>14} |
+| Markets passing filters | {stats.markets_valid:>14} |
+| Trades recommended      | {stats.trades_recommended:>14} |
+| Hit rate                | {stats.hit_rate:>13.1f}% |
 +-------------------------+----------------+
 
 REJECTION BREAKDOWN
-"""
-        for reason, count in sorted(rejections_by_reason.items(), key=lambda x: -x[1]):
-            summary += f"  - {reason}: {count}\n"
+""")
+        for reason, count in stats.rejections_sorted:
+            buf.write(f"  - {reason}: {count}\n")
         
         # Add bracket strategies (combined strategies for related markets)
         if bracket_strategies and BRACKET_SUPPORT:
-            generator = BracketStrategyGenerator()
+            generator = self._bracket_generator
             for strategy in bracket_strategies:
-                summary += generator.format_strategy_text(strategy)
+                buf.write(generator.format_strategy_text(strategy))
         
         # Add analyzed markets with table format and highlights
-        if analyzed_markets and len(analyzed_markets) > 0:
-            summary += f"""
+        top_markets, top_near_misses, recommended = inputs.top_markets, inputs.near_misses, inputs.recommended
+        if top_markets:
+            buf.write(f"""
 {'='*100}
                               MARKETS ANALYZED
 {'='*100}
@@ -736,47 +953,31 @@ REJECTION BREAKDOWN
 +{'='*50}+{'='*8}+{'='*8}+{'='*8}+{'='*15}+
 | {'MARKET':<48} | {'MODEL':>6} | {'PRICE':>6} | {'EDGE':>6} | {'ACTION':<13} |
 +{'-'*50}+{'-'*8}+{'-'*8}+{'-'*8}+{'-'*15}+
-"""
-            for am in analyzed_markets[:15]:
-                action = am.get('action', 'NO_TRADE')
-                question = am.get('question', 'Unknown')[:47]
-                model_pct = am.get('model_prob', 0) * 100
-                market_pct = am.get('market_price', 0) * 100
-                edge = am.get('edge', 0)
-                url = am.get('url', '')
-                
-                # Highlight YES recommendations
-                if action in ('BUY_YES', 'BUY_NO'):
-                    marker = ">>>"
-                    action_str = f"*** {action} ***"
-                else:
-                    marker = "   "
-                    action_str = action
-                
-                summary += f"|{marker}{question:<47} | {model_pct:>5.0f}% | {market_pct:>5.0f}% | {edge:>+5.1f}% | {action_str:<13} |\n"
-            
-            summary += f"+{'-'*50}+{'-'*8}+{'-'*8}+{'-'*8}+{'-'*15}+\n"
+""")
+            buf.writelines(map(_summary_row, top_markets))
+            
+            buf.write(f"+{'-'*50}+{'-'*8}+{'-'*8}+{'-'*8}+{'-'*15}+\n")
             
             # Add direct links for recommended trades
-            recommended = [am for am in analyzed_markets if am.get('action') in ('BUY_YES', 'BUY_NO')]
             if recommended:
-                summary += f"""
+                buf.write(f"""
 {'*'*100}
                          >>> RECOMMENDED TRADES - CLICK TO EXECUTE <<<
 {'*'*100}
-"""
-                for i, am in enumerate(recommended, 1):
-                    url = am.get('url', '')
-                    summary += f"""
-  [{i}] {am.get('question', 'Unknown')}
-      ACTION: {am.get('action')} | Edge: {am.get('edge', 0):+.1f}% | Model: {am.get('model_prob', 0)*100:.0f}% vs Market: {am.get('market_price', 0)*100:.0f}%
+""")
+                for i, (action, question, model_prob, market_price, edge, url) in enumerate(
+                    map(_ROW_FIELDS, recommended), 1
+                ):
+                    buf.write(f"""
+  [{i}] {question}
+      ACTION: {action} | Edge: {edge:+.1f}% | Model: {model_prob*100:.0f}% vs Market: {market_price*100:.0f}%
       >>> TRADE HERE: {url}
-"""
-                summary += f"{'*'*100}\n"
+""")
+                buf.write(f"{'*'*100}\n")
         
         # Add near-miss suggestions with URLs
-        if near_misses and len(near_misses) > 0:
-            summary += f"""
+        if top_near_misses:
+            buf.write(f"""
 {'='*100}
                      NEAR-MISS MARKETS (Review Manually)
 {'='*100}
@@ -785,26 +986,22 @@ These high-volume markets almost passed filters - worth checking:
 +{'-'*70}+{'-'*15}+{'-'*12}+
 | {'MARKET':<68} | {'VOLUME':>13} | {'REASON':<10} |
 +{'-'*70}+{'-'*15}+{'-'*12}+
-"""
-            for nm in near_misses[:8]:
-                question = nm.get('question', 'Unknown')[:67]
-                vol = nm.get('volume', 0)
-                reason = nm.get('reason', 'Unknown')[:30].split(':')[0]
-                summary += f"| {question:<68} | ${vol:>12,.0f} | {reason:<10} |\n"
+""")
+            buf.writelines(map(_near_miss_row, top_near_misses))
             
-            summary += f"+{'-'*70}+{'-'*15}+{'-'*12}+\n"
+            buf.write(f"+{'-'*70}+{'-'*15}+{'-'*12}+\n")
             
-            summary += "\nMANUAL CHECK LINKS:\n"
-            for i, nm in enumerate(near_misses[:5], 1):
+            buf.write("\nMANUAL CHECK LINKS:\n")
+            for i, nm in enumerate(top_near_misses[:5], 1):
                 question = nm.get('question', 'Unknown')
                 # Use actual URL from API, fallback to search
-                url = nm.get('url', '') or f"https://polymarket.com/markets?_q={question[:30].replace(' ', '+')}"
-                summary += f"  {i}. {question[:60]}\n     {url}\n"
+                url = _near_miss_url(nm)
+                buf.write(f"  {i}. {_trunc(question)}\n     {url}\n")
         
-        summary += f"""
+        buf.write(f"""
 {'='*100}
 TIP: Run with --eoy flag for more relaxed filters on end-of-year markets.
 For support: Review the generated trade_rec_*.txt files for full details.
 {'='*100}
-"""
-        return summary
+""")
+        return buf.getvalue()
@@ -5,7 +5,7 @@ Buys USDC and sends it to your trading wallet automatically
 
 import os
 from dotenv import load_dotenv
-from coinbase.rest import RESTClient
+from coinbase_client import get_client
 from eth_account import Account
 import time
 
@@ -19,9 +19,10 @@ API_SECRET = os.getenv('CLIENT_API_SECRET')
 WALLET_PK = os.getenv('POLYGON_WALLET_PRIVATE_KEY')
 wallet = Account.from_key(WALLET_PK)
 WALLET_ADDRESS = wallet.address
+SEP60 = "=" * 60
 
 # Initialize Coinbase client
-client = RESTClient(api_key=API_KEY, api_secret=API_SECRET)
+client = get_client()
 
 def check_usdc_balance():
     """Check current USDC balance in Coinbase"""
@@ -89,9 +90,9 @@ def auto_fund_wallet(amount=20):
     """
     Complete automation: Buy USDC and send to wallet
     """
-    print("=" * 60)
+    print(SEP60)
     print("🤖 AUTOMATED COINBASE → POLYGON TRANSFER")
-    print("=" * 60)
+    print(SEP60)
     print(f"Amount: ${amount}")
     print(f"Destination: {WALLET_ADDRESS}\n")
     
@@ -115,9 +116,9 @@ def auto_fund_wallet(amount=20):
     
     # Step 3: Send to wallet
     if send_to_polygon_wallet(amount):
-        print("\n" + "=" * 60)
+        print("\n" + SEP60)
         print("✅ SUCCESS!")
-        print("=" * 60)
+        print(SEP60)
         print("Run: python check_balance.py")
         print("To verify funds arrived in your wallet")
         return True
@@ -132,7 +133,7 @@ def auto_fund_wallet(amount=20):
 
 if __name__ == "__main__":
     print("\n🎯 Coinbase Automation Tool")
-    print("=" * 60)
+    print(SEP60)
     
     # Check if API credentials are set
     if not API_KEY or not API_SECRET:
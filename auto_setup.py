@@ -5,7 +5,7 @@ Uses Coinbase API to fund your trading wallet automatically
 
 import os
 from dotenv import load_dotenv
-from coinbase.rest import RESTClient
+from coinbase_client import get_client
 from eth_account import Account
 import time
 import sys
@@ -13,33 +13,32 @@ import sys
 load_dotenv()
 
 # Configuration
-API_KEY = os.getenv('CLIENT_API_KEY')
-API_SECRET = os.getenv('CLIENT_API_SECRET')
 WALLET_PK = os.getenv('POLYGON_WALLET_PRIVATE_KEY')
 wallet = Account.from_key(WALLET_PK)
 WALLET_ADDRESS = wallet.address
+SEP70 = "=" * 70
 
 # Initialize client
-client = RESTClient(api_key=API_KEY, api_secret=API_SECRET)
+client = get_client()
 
-print("=" * 70)
+print(SEP70)
 print("🤖 FULLY AUTOMATED POLYMARKET SETUP")
-print("=" * 70)
+print(SEP70)
 print(f"Trading Wallet: {WALLET_ADDRESS}")
 print()
 
-def get_balance(currency):
-    """Get balance for a specific currency"""
+def get_balances(currencies):
+    """Get balances for several currencies from a single get_accounts call"""
+    balances = dict.fromkeys(currencies, 0)
     try:
         response = client.get_accounts()
         for account in response.accounts:
-            if account.currency == currency:
+            if account.currency in balances:
                 balance_dict = account.available_balance
-                return float(balance_dict.get('value', 0))
-        return 0
+                balances[account.currency] = float(balance_dict.get('value', 0))
     except Exception as e:
-        print(f"❌ Error getting {currency} balance: {e}")
-        return 0
+        print(f"❌ Error getting {', '.join(currencies)} balances: {e}")
+    return balances
 
 def send_crypto(currency, amount, network="polygon"):
     """Send crypto to trading wallet"""
@@ -75,43 +74,71 @@ def send_crypto(currency, amount, network="polygon"):
         
         return False
 
+def wait_for_fill(order, attempts=10, poll_seconds=1):
+    """Poll a market order until it fills; returns the filled size (0 if unconfirmed)"""
+    try:
+        order_id = order['success_response']['order_id']
+        for _ in range(attempts):
+            status = client.get_order(order_id)['order']
+            if status['status'] == 'FILLED':
+                return float(status['filled_size'])
+            time.sleep(poll_seconds)
+    except Exception as e:
+        print(f"⚠️ Could not confirm fill: {e}")
+    return 0
+
+_gas_product_id = None
+
+def gas_product_id():
+    """Product id for the gas token (POL-USD, or legacy MATIC-USD), probed once"""
+    global _gas_product_id
+    if _gas_product_id is None:
+        for product_id in ("POL-USD", "MATIC-USD"):
+            try:
+                client.get_product(product_id)
+            except Exception:
+                continue
+            _gas_product_id = product_id
+            break
+        else:
+            raise RuntimeError("Neither POL-USD nor MATIC-USD is tradeable")
+    return _gas_product_id
+
 def buy_matic(amount_usd=2):
-    """Buy MATIC/POL"""
+    """Buy MATIC/POL; returns (currency, filled size) or None on failure"""
     try:
         print(f"\n💰 Buying ${amount_usd} MATIC/POL...")
         
-        # Try POL-USD first (new name)
-        try:
-            order = client.market_order_buy(
-                client_order_id=f"polymarket_matic_{int(time.time())}",
-                product_id="POL-USD",
-                quote_size=str(amount_usd)
-            )
-            print(f"✅ POL bought!")
-            time.sleep(5)
-            return True
-        except:
-            # Try MATIC-USD
-            order = client.market_order_buy(
-                client_order_id=f"polymarket_matic_{int(time.time())}",
-                product_id="MATIC-USD",
-                quote_size=str(amount_usd)
-            )
-            print(f"✅ MATIC bought!")
-            time.sleep(5)
-            return True
+        product_id = gas_product_id()
+        order = client.market_order_buy(
+            client_order_id=f"polymarket_matic_{int(time.time())}",
+            product_id=product_id,
+            quote_size=str(amount_usd)
+        )
+        currency = product_id.split("-")[0]
+        print(f"✅ {currency} bought!")
+        return currency, wait_for_fill(order)
             
     except Exception as e:
         print(f"❌ Buy failed: {e}")
         print(f"\n💡 MANUAL: Buy $2 MATIC/POL in Coinbase app")
-        return False
+        return None
+
+def send_gas_token(matic_balance, pol_balance):
+    """Send whichever of POL/MATIC we have more of"""
+    if pol_balance > matic_balance:
+        return send_crypto("POL", pol_balance)
+    if matic_balance > 0:
+        return send_crypto("MATIC", matic_balance)
+    return True
 
 def main():
     # Step 1: Check Coinbase balances
     print("📊 Checking Coinbase balances...")
-    usdc_balance = get_balance("USDC")
-    matic_balance = get_balance("MATIC")
-    pol_balance = get_balance("POL")
+    balances = get_balances(["USDC", "MATIC", "POL"])
+    usdc_balance = balances["USDC"]
+    matic_balance = balances["MATIC"]
+    pol_balance = balances["POL"]
     
     # POL is the new name for MATIC
     total_matic = matic_balance + pol_balance
@@ -129,34 +156,47 @@ def main():
         return False
     
     # Step 3: Buy MATIC if needed
+    optimistic = False
     if total_matic < 0.5:  # Need at least 0.5 MATIC
         print(f"\n💡 Need more MATIC for gas (have {total_matic:.6f})")
-        if not buy_matic(2):
+        bought = buy_matic(2)
+        if not bought:
             return False
-        time.sleep(10)  # Wait for buy to settle
         
-        # Refresh balance
-        matic_balance = get_balance("MATIC")
-        pol_balance = get_balance("POL")
+        currency, filled_size = bought
+        if filled_size:
+            # The fill is confirmed by the order itself; add it locally
+            # instead of refetching every account
+            optimistic = True
+            if currency == "POL":
+                pol_balance += filled_size
+            else:
+                matic_balance += filled_size
+        else:
+            time.sleep(10)  # Wait for buy to settle
+            
+            # Refresh balance
+            balances = get_balances(["MATIC", "POL"])
+            matic_balance = balances["MATIC"]
+            pol_balance = balances["POL"]
         total_matic = matic_balance + pol_balance
     
     # Step 4: Send MATIC/POL
-    # Send whichever we have more of
-    if pol_balance > matic_balance:
-        if not send_crypto("POL", pol_balance):
+    if not send_gas_token(matic_balance, pol_balance):
+        if not optimistic:
             return False
-    elif matic_balance > 0:
-        if not send_crypto("MATIC", matic_balance):
+        
+        # The bought amount may not be withdrawable yet; refetch once and retry
+        time.sleep(10)
+        balances = get_balances(["MATIC", "POL"])
+        if not send_gas_token(balances["MATIC"], balances["POL"]):
             return False
     
-    print("\n" + "=" * 70)
+    print("\n" + SEP70)
     print("✅ SETUP COMPLETE!")
-    print("=" * 70)
+    print(SEP70)
     print(f"\n⏳ Waiting 3 minutes for transfers to arrive...")
-    
-    for i in range(180, 0, -30):
-        print(f"   {i} seconds remaining...")
-        time.sleep(30)
+    time.sleep(180)
     
     print("\n🚀 STARTING AUTONOMOUS TRADER...")
     print("\nRun this command:")
@@ -1,10 +1,14 @@
 """
 Bot Controller - Manages the automated trading bot lifecycle
 """
+import asyncio
+import json
 import threading
 import time
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Deque
 import logging
 
 from automated_trader.market_selector import MarketSelector
@@ -16,6 +20,36 @@ from automated_trader import config
 
 logger = logging.getLogger(__name__)
 
+ITERATION_RULE = "\n" + "=" * 60
+
+
+def _clob_token_ids(market: Dict[str, Any]) -> List[str]:
+    """YES/NO CLOB token ids for a Gamma market ([] if unavailable)"""
+    token_ids = market.get('clobTokenIds') or []
+    if isinstance(token_ids, str):
+        try:
+            token_ids = json.loads(token_ids)
+        except ValueError:
+            return []
+    return token_ids if len(token_ids) >= 2 else []
+
+
+def _book_side(summary) -> Dict[str, List[Dict[str, str]]]:
+    """Convert a CLOB OrderBookSummary into the bids/asks dicts the strategy reads"""
+    return {
+        'bids': [{'price': o.price, 'size': o.size} for o in summary.bids or []],
+        'asks': [{'price': o.price, 'size': o.size} for o in summary.asks or []],
+    }
+
+
+@dataclass
+class _BotRun:
+    """Loop state owned by a single start()/stop() cycle"""
+    loop: asyncio.AbstractEventLoop
+    running: bool = True
+    stop_event: Optional[asyncio.Event] = None  # Created on the loop thread
+    task: Optional[asyncio.Task] = None
+
 
 class BotController:
     """Controls the automated trading bot with start/stop capability"""
@@ -31,21 +65,32 @@ class BotController:
         self.risk_controller = RiskController(config.INITIAL_BANKROLL)
         self.trade_logger = TradeLogger()
         
+        # Config values read on every iteration, bound once
+        self._poll_seconds = config.ORDER_BOOK_POLL_SECONDS
+        self._dry_run = config.DRY_RUN_MODE
+        
         # Bot state
         self.is_running = False
         self.thread: Optional[threading.Thread] = None
+        self._run: Optional[_BotRun] = None
         self.iteration = 0
         self.last_scan_time: Optional[datetime] = None
         self.status_message = "Idle"
-        self.logs: List[str] = []
+        self.logs: Deque[str] = deque(maxlen=100)  # Keeps the last 100 logs
+        self._clock_second = -1
+        self._clock_str = ""
         
     def start(self):
-        """Start the bot in a background thread"""
+        """Start the bot on a dedicated event loop thread"""
         if self.is_running:
             return False, "Bot is already running"
         
         self.is_running = True
-        self.thread = threading.Thread(target=self._run_loop, daemon=True)
+        # Each run gets its own loop and stop state, so a quick restart
+        # never shares them with a run that is still winding down
+        run = _BotRun(asyncio.new_event_loop())
+        self._run = run
+        self.thread = threading.Thread(target=self._run_event_loop, args=(run,), daemon=True)
         self.thread.start()
         
         self._add_log("🚀 Bot started")
@@ -57,49 +102,80 @@ class BotController:
             return False, "Bot is not running"
         
         self.is_running = False
-        if self.thread:
-            self.thread.join(timeout=5)
+        run, self._run = self._run, None
+        if run is not None:
+            # Returns immediately: the loop thread wakes from its poll wait
+            # (or abandons an in-flight fetch) and exits on its own.
+            run.running = False
+            run.loop.call_soon_threadsafe(self._shutdown, run)
         
         self._add_log("🛑 Bot stopped")
         return True, "Bot stopped successfully"
     
-    def _run_loop(self):
-        """Main bot loop (runs in background thread)"""
-        while self.is_running:
+    def _run_event_loop(self, run: _BotRun):
+        """Event loop thread; exits once _run_loop finishes"""
+        loop = run.loop
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._run_loop(run))
+        except asyncio.CancelledError:
+            pass
+        finally:
+            loop.close()
+    
+    def _shutdown(self, run: _BotRun):
+        """Wake and cancel one run's bot loop (runs on that run's event loop thread)"""
+        if run.stop_event is not None:
+            run.stop_event.set()
+        if run.task is not None:
+            run.task.cancel()
+    
+    async def _wait_for_next_poll(self, run: _BotRun):
+        """Sleep until the next poll, returning early if the run is stopped"""
+        try:
+            await asyncio.wait_for(run.stop_event.wait(), timeout=self._poll_seconds)
+        except asyncio.TimeoutError:
+            pass
+    
+    async def _run_loop(self, run: _BotRun):
+        """Main bot loop (runs on the event loop thread)"""
+        run.stop_event = asyncio.Event()
+        run.task = asyncio.current_task()
+        while run.running:
             try:
                 self.iteration += 1
-                self._add_log(f"\n{'='*60}")
-                self._add_log(f"ITERATION {self.iteration} - {datetime.now().strftime('%H:%M:%S')}")
+                self._add_log(ITERATION_RULE)
+                self._add_log(f"ITERATION {self.iteration} - {self._clock()}")
                 
                 # Check risk limits
                 can_trade, reason = self.risk_controller.can_trade()
                 if not can_trade:
                     self.status_message = f"Halted: {reason}"
                     self._add_log(f"⚠️ {self.status_message}")
-                    time.sleep(config.ORDER_BOOK_POLL_SECONDS)
+                    await self._wait_for_next_poll(run)
                     continue
                 
                 # Check daily reset
                 self.risk_controller.check_daily_reset()
                 
                 # Process open positions
-                self._process_positions()
+                await self._process_positions()
                 
                 # Scan for new opportunities
-                self._scan_markets()
+                await self._scan_markets(run)
                 
                 self.last_scan_time = datetime.now()
                 self.status_message = "Scanning for opportunities..."
                 
                 # Wait for next iteration
-                time.sleep(config.ORDER_BOOK_POLL_SECONDS)
+                await self._wait_for_next_poll(run)
                 
             except Exception as e:
                 self._add_log(f"❌ Error: {str(e)}")
                 logger.error(f"Bot error: {e}", exc_info=True)
-                time.sleep(config.ORDER_BOOK_POLL_SECONDS)
+                await self._wait_for_next_poll(run)
     
-    def _scan_markets(self):
+    async def _scan_markets(self, run: _BotRun):
         """Scan markets for entry opportunities"""
         try:
             # Check if we can open positions
@@ -111,68 +187,115 @@ class BotController:
                 return
             
             # Get tradeable markets
-            markets = self.market_selector.get_tradeable_markets()
+            markets = await asyncio.to_thread(self.market_selector.get_tradeable_markets)
             self._add_log(f"📊 Found {len(markets)} tradeable markets")
             
             if not markets:
                 self._add_log("⚠️ No markets meet criteria (volume, spread, resolution time)")
                 return
             
+            await self._attach_order_books(markets)
+            
+            # Bind per-scan lookups once; the loop below runs for every market
+            has_position = self.position_manager.has_position
+            signal_generator = self.signal_generator
+            total = len(markets)
+            
+            # Each market's lines are buffered and appended to the log in one batch
+            lines: List[str] = []
+            log = lines.append
+            
             # Check each market for signals
             for idx, market in enumerate(markets, 1):
-                if not self.is_running:
+                if not run.running:
                     break
                 
-                market_id = market.get('condition_id')
-                market_question = market.get('question', 'Unknown')[:60]
+                m_get = market.get
+                market_id = m_get('condition_id')
+                market_question = m_get('question', 'Unknown')[:60]
                 
-                if self.position_manager.has_position(market_id):
-                    continue
-                
-                self._add_log(f"\n🔍 Analyzing Market {idx}/{len(markets)}:")
-                self._add_log(f"   {market_question}...")
-                
-                # Calculate fair value and generate signal
-                order_book = market.get('order_book')
-                if not order_book:
-                    self._add_log("   ⚠️ No order book data")
+                if has_position(market_id):
                     continue
                 
-                fair_value = self.signal_generator.calculate_fair_value(order_book)
-                if fair_value is None:
-                    self._add_log("   ⚠️ Cannot calculate fair value")
-                    continue
-                
-                # Get current prices for display
-                yes_asks = order_book.get('yes', {}).get('asks', [])
-                no_asks = order_book.get('no', {}).get('asks', [])
-                best_yes = min([float(a['price']) for a in yes_asks]) if yes_asks else None
-                best_no = min([float(a['price']) for a in no_asks]) if no_asks else None
-                
-                self._add_log(f"   Fair Value: {fair_value:.1%}")
-                self._add_log(f"   YES Price: ${best_yes:.3f} | NO Price: ${best_no:.3f}")
-                
-                signal, entry_price, signal_reason = self.signal_generator.generate_entry_signal(
-                    market, fair_value
-                )
-                
-                if signal.value in ['BUY_YES', 'BUY_NO']:
-                    self._add_log(f"   ✅ SIGNAL: {signal_reason}")
-                    self._execute_entry(market, signal, entry_price, signal_reason)
+                try:
+                    log(f"\n🔍 Analyzing Market {idx}/{total}:")
+                    log(f"   {market_question}...")
                     
-                    # Check if we can open more
-                    can_open, _ = self.position_manager.can_open_position(
-                        self.risk_controller.get_available_capital()
+                    # Calculate fair value and generate signal
+                    order_book = m_get('order_book')
+                    if not order_book:
+                        log("   ⚠️ No order book data")
+                        continue
+                    
+                    fair_value = signal_generator.calculate_fair_value(order_book)
+                    if fair_value is None:
+                        log("   ⚠️ Cannot calculate fair value")
+                        continue
+                    
+                    # Get current prices for display
+                    yes_asks = order_book.get('yes', {}).get('asks', [])
+                    no_asks = order_book.get('no', {}).get('asks', [])
+                    best_yes = min((float(a['price']) for a in yes_asks), default=None)
+                    best_no = min((float(a['price']) for a in no_asks), default=None)
+                    
+                    log(f"   Fair Value: {fair_value:.1%}")
+                    log(f"   YES Price: ${best_yes:.3f} | NO Price: ${best_no:.3f}")
+                    
+                    signal, entry_price, signal_reason = signal_generator.generate_entry_signal(
+                        market, fair_value
                     )
-                    if not can_open:
-                        break
-                else:
-                    self._add_log(f"   ❌ {signal_reason}")
+                    
+                    if signal.value in ['BUY_YES', 'BUY_NO']:
+                        log(f"   ✅ SIGNAL: {signal_reason}")
+                        # Entry logs its own lines; keep them after the signal
+                        self._add_logs(lines)
+                        lines.clear()
+                        self._execute_entry(market, signal, entry_price, signal_reason)
+                        
+                        # Check if we can open more
+                        can_open, _ = self.position_manager.can_open_position(
+                            self.risk_controller.get_available_capital()
+                        )
+                        if not can_open:
+                            break
+                    else:
+                        log(f"   ❌ {signal_reason}")
+                finally:
+                    self._add_logs(lines)
+                    lines.clear()
                         
         except Exception as e:
             self._add_log(f"❌ Scan error: {str(e)}")
     
-    def _process_positions(self):
+    async def _attach_order_books(self, markets: List[Dict[str, Any]]):
+        """Fetch order books for all candidate markets in a single batched call"""
+        pending = []
+        for market in markets:
+            # Market lists are cached across iterations; never reuse a stale book
+            market.pop('order_book', None)
+            if self.position_manager.has_position(market.get('condition_id')):
+                continue
+            token_ids = _clob_token_ids(market)
+            if token_ids:
+                pending.append((market, token_ids[0], token_ids[1]))
+        
+        if not pending:
+            return
+        
+        token_ids = [token for _, yes_token, no_token in pending for token in (yes_token, no_token)]
+        try:
+            books = await asyncio.to_thread(self.polymarket.get_orderbooks, token_ids)
+        except Exception as e:
+            self._add_log(f"⚠️ Order book fetch failed: {str(e)}")
+            return
+        
+        for market, yes_token, no_token in pending:
+            yes_book = books.get(yes_token)
+            no_book = books.get(no_token)
+            if yes_book is not None and no_book is not None:
+                market['order_book'] = {'yes': _book_side(yes_book), 'no': _book_side(no_book)}
+    
+    async def _process_positions(self):
         """Check open positions for exits"""
         open_positions = self.position_manager.get_open_positions()
         
@@ -181,12 +304,12 @@ class BotController:
         
         self._add_log(f"📈 Monitoring {len(open_positions)} position(s)")
         
-        for position in open_positions:
+        # Price every position from one batched order book call
+        order_books = await self._get_position_order_books(open_positions)
+        
+        for position, order_book in zip(open_positions, order_books):
             try:
-                market_id = position['market_id']
-                
                 # Get current price
-                order_book = self._get_order_book(market_id)
                 if not order_book:
                     continue
                 
@@ -218,15 +341,11 @@ class BotController:
         self._add_log(f"   {signal.value} @ ${entry_price:.3f} | Size: ${position_size:.2f}")
         self._add_log(f"   Target: ${target_price:.3f} | Stop: ${stop_price:.3f}")
         
-        if config.DRY_RUN_MODE:
+        if self._dry_run:
             self._add_log(f"   ⚠️ DRY RUN - No real trade")
         
-        # Record position
-        try:
-            end_date_str = market.get('end_date_iso')
-            end_date = datetime.fromisoformat(end_date_str.replace('Z', '+00:00')) if end_date_str else None
-        except:
-            end_date = None
+        # Record position (end date already parsed by MarketSelector)
+        end_date = market.get('_end_date')
         
         self.position_manager.open_position(
             market_id=market_id,
@@ -236,18 +355,20 @@ class BotController:
             target_price=target_price,
             stop_price=stop_price,
             position_size=position_size,
-            market_end_date=end_date
+            market_end_date=end_date,
+            token_ids=_clob_token_ids(market)[:2]
         )
         
         position = self.position_manager.get_position(market_id)
         self.trade_logger.log_trade_entry(position, reason)
+        self.market_selector.invalidate()
     
     def _execute_exit(self, position, exit_price, reason):
         """Execute exit trade"""
         self._add_log(f"📉 EXIT: {position['market_question'][:50]}...")
         self._add_log(f"   Entry: ${position['entry_price']:.3f} → Exit: ${exit_price:.3f}")
         
-        if config.DRY_RUN_MODE:
+        if self._dry_run:
             self._add_log(f"   ⚠️ DRY RUN - No real trade")
         
         closed_position = self.position_manager.close_position(
@@ -261,33 +382,56 @@ class BotController:
         
         self._add_log(f"   💰 P&L: ${closed_position['pnl']:+.2f} ({closed_position['pnl_pct']:+.1f}%)")
     
-    def _get_order_book(self, market_id: str) -> Optional[Dict]:
-        """Get order book for market"""
+    async def _get_position_order_books(self, positions: List[Dict[str, Any]]) -> List[Optional[Dict]]:
+        """Order books for open positions, in order (None where unavailable)"""
+        token_ids = [token for position in positions for token in position.get('token_ids') or []]
+        if not token_ids:
+            return [None] * len(positions)
+        
         try:
-            return self.polymarket.get_order_book(market_id)
-        except:
-            return None
+            books = await asyncio.to_thread(self.polymarket.get_orderbooks, token_ids)
+        except Exception as e:
+            self._add_log(f"⚠️ Order book fetch failed: {str(e)}")
+            return [None] * len(positions)
+        
+        order_books = []
+        for position in positions:
+            yes_token, no_token = position.get('token_ids') or (None, None)
+            yes_book = books.get(yes_token)
+            no_book = books.get(no_token)
+            if yes_book is None or no_book is None:
+                order_books.append(None)
+            else:
+                order_books.append({'yes': _book_side(yes_book), 'no': _book_side(no_book)})
+        return order_books
     
     def _get_current_price(self, order_book: Dict, signal: str) -> float:
         """Get current market price based on position side"""
         try:
             if 'YES' in signal:
                 bids = order_book.get('yes', {}).get('bids', [])
-                return max([float(bid['price']) for bid in bids]) if bids else 0.5
             else:
                 bids = order_book.get('no', {}).get('bids', [])
-                return max([float(bid['price']) for bid in bids]) if bids else 0.5
+            return max((float(bid['price']) for bid in bids), default=0.5)
         except:
             return 0.5
     
+    def _clock(self) -> str:
+        """Current time as HH:MM:SS, formatted at most once per second"""
+        second = int(time.time())
+        if second != self._clock_second:
+            self._clock_second = second
+            self._clock_str = datetime.fromtimestamp(second).strftime("%H:%M:%S")
+        return self._clock_str
+    
     def _add_log(self, message: str):
         """Add message to logs"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.logs.append(f"[{timestamp}] {message}")
-        
-        # Keep last 100 logs
-        if len(self.logs) > 100:
-            self.logs = self.logs[-100:]
+        self.logs.append(f"[{self._clock()}] {message}")
+    
+    def _add_logs(self, messages: List[str]):
+        """Add several messages to logs under one timestamp"""
+        stamp = f"[{self._clock()}] "
+        self.logs.extend(stamp + message for message in messages)
     
     def get_status(self) -> Dict[str, Any]:
         """Get current bot status"""
@@ -307,7 +451,7 @@ class BotController:
     
     def get_logs(self, last_n: int = 20) -> List[str]:
         """Get recent logs"""
-        return self.logs[-last_n:]
+        return list(self.logs)[-last_n:]
     
     def get_positions(self) -> List[Dict[str, Any]]:
         """Get open positions"""
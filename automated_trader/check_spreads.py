@@ -1,6 +1,8 @@
 import sys
 sys.path.append('.')
 
+import numpy as np
+
 from agents.polymarket.gamma import GammaMarketClient
 
 gamma = GammaMarketClient()
@@ -10,18 +12,17 @@ markets = gamma.get_markets(querystring_params={
     "limit": 10
 })
 
+# Columnar volume/spread so the filter is evaluated in one vectorized pass
+volume = np.array([m.get("volume", 0) for m in markets], dtype=float)
+spread = np.array([m.get("spread", 0) for m in markets], dtype=float)
+
 print("\nMarkets with spread data:")
 print("=" * 80)
-for m in markets:
+for i in np.flatnonzero(volume >= 100000):  # Our min total volume
+    m = markets[i]
     question = m.get("question", "Unknown")[:50]
-    spread = m.get("spread", 0)
-    best_bid = m.get("bestBid", 0)
-    best_ask = m.get("bestAsk", 0)
-    volume = float(m.get("volume", 0))
-    
-    if volume >= 100000:  # Our min total volume
-        print(f"\n{question}...")
-        print(f"  Spread: {spread}")
-        print(f"  Best Bid: {best_bid}")
-        print(f"  Best Ask: {best_ask}")
-        print(f"  Spread %: {float(spread) * 100:.2f}%")
+    print(f"\n{question}...")
+    print(f"  Spread: {m.get('spread', 0)}")
+    print(f"  Best Bid: {m.get('bestBid', 0)}")
+    print(f"  Best Ask: {m.get('bestAsk', 0)}")
+    print(f"  Spread %: {spread[i] * 100:.2f}%")
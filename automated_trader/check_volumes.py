@@ -1,6 +1,8 @@
 import sys
 sys.path.append('.')
 
+import numpy as np
+
 from agents.polymarket.gamma import GammaMarketClient
 
 gamma = GammaMarketClient()
@@ -10,16 +12,18 @@ markets = gamma.get_markets(querystring_params={
     "limit": 10
 })
 
+# Columnar volumes so the thresholds are evaluated in one vectorized pass
+vol_total = np.array([m.get("volume", 0) for m in markets], dtype=float)
+vol_24h = np.array([m.get("volume24hr", 0) for m in markets], dtype=float)
+meets_total = vol_total >= 150000  # Our min total volume
+meets_24h = vol_24h >= 10000
+
 print("\nMarkets with 24h volume:")
 print("=" * 80)
-for m in markets:
-    vol_total = float(m.get("volume", 0))
-    vol_24h = float(m.get("volume24hr", 0))
-    question = m.get("question", "Unknown")[:50]
-    
-    if vol_total >= 150000:  # Our min total volume
-        print(f"\n{question}...")
-        print(f"  Total Volume: ${vol_total:,.0f}")
-        print(f"  24h Volume: ${vol_24h:,.0f}")
-        print(f"  Meets total vol?: {vol_total >= 150000}")
-        print(f"  Meets 24h vol?: {vol_24h >= 10000}")
+for i in np.flatnonzero(meets_total):
+    question = markets[i].get("question", "Unknown")[:50]
+    print(f"\n{question}...")
+    print(f"  Total Volume: ${vol_total[i]:,.0f}")
+    print(f"  24h Volume: ${vol_24h[i]:,.0f}")
+    print(f"  Meets total vol?: {meets_total[i]}")
+    print(f"  Meets 24h vol?: {meets_24h[i]}")
@@ -2,6 +2,7 @@
 Configuration for Automated Polymarket Trading Bot
 All strategy parameters defined as variables - do not hardcode in logic
 """
+import re
 
 # ============================================================================
 # MARKET SELECTION CRITERIA
@@ -16,6 +17,10 @@ EXCLUDED_KEYWORDS = [
     "breaking", "just announced", "live", "now", "urgent",
     "today", "tomorrow", "this week"
 ]
+# All keywords as one case-insensitive whole-word pattern (one scan per text)
+EXCLUDED_RE = re.compile(
+    r"\b(" + "|".join(map(re.escape, EXCLUDED_KEYWORDS)) + r")\b", re.IGNORECASE
+)
 
 # Market health gate
 MAX_BID_ASK_SPREAD_PCT = 0.08   # Skip if spread > 8%
@@ -58,6 +63,7 @@ ORDER_BOOK_POLL_SECONDS = 15    # How often to check order books
 MAX_PARTIAL_FILL_WAIT_MINUTES = 10  # Wait time for partial fills
 API_RETRY_ATTEMPTS = 3          # Retries for API errors
 API_RETRY_DELAY_SECONDS = 5     # Delay between retries
+MARKET_LIST_CACHE_SECONDS = 60  # Reuse the filtered Gamma market list this long
 
 # ============================================================================
 # LOGGING
@@ -2,15 +2,63 @@
 Market Selection Module
 Filters markets based on volume, resolution date, and market type criteria
 """
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
 import logging
+import time
+
+import numpy as np
+import orjson
+
+try:
+    import ciso8601  # C ISO 8601 parser; handles 'Z' natively
+    CISO8601_SUPPORT = True
+except ImportError:
+    CISO8601_SUPPORT = False
 
 from automated_trader import config
 
 logger = logging.getLogger(__name__)
 
 
+def _float_column(markets: List[Dict[str, Any]], key: str, default: float) -> np.ndarray:
+    """One numeric Gamma field for every market as a float array (None -> NaN)"""
+    return np.array([market.get(key, default) for market in markets], dtype=float)
+
+
+# Marks an argument the caller did not supply (None is a valid hours result)
+_NOT_GIVEN = object()
+
+
+@lru_cache(maxsize=1024)
+def _parse_end_date(end_date_str: str) -> datetime:
+    """Parse a Gamma end date (memoized; the same dates recur every cycle)"""
+    if CISO8601_SUPPORT:
+        try:
+            return ciso8601.parse_datetime(end_date_str)
+        except ValueError:
+            pass  # Stricter than fromisoformat; let the stdlib have a go
+    return datetime.fromisoformat(end_date_str.replace('Z', '+00:00'))
+
+
+def _order_price(order) -> float:
+    """Price of an order book level (dict or OrderSummary object)"""
+    if isinstance(order, dict):
+        return float(order.get('price', 0))
+    return float(order.price) if hasattr(order, 'price') else 0
+
+
+def _relative_spread(bid: float, ask: float) -> float:
+    """Spread relative to the midpoint: (ask - bid) / ((ask + bid) / 2)"""
+    if bid <= 0 or ask <= 0:
+        return 1.0
+    midpoint = (ask + bid) / 2.0
+    if midpoint == 0:
+        return 1.0
+    return (ask - bid) / midpoint
+
+
 class MarketSelector:
     """Selects markets that meet trading criteria"""
     
@@ -22,14 +70,33 @@ class MarketSelector:
         """
         self.gamma = gamma_client
         self.polymarket = polymarket_client
+        # (monotonic timestamp, tradeable markets) from the last Gamma fetch
+        self._cache: Optional[tuple] = None
         
     def get_tradeable_markets(self) -> List[Dict[str, Any]]:
         """
         Get all markets that meet selection criteria
         
+        The Gamma market list moves far slower than order books, so the
+        filtered list is reused for MARKET_LIST_CACHE_SECONDS.
+        
         Returns:
-            List of market dictionaries with metadata and order book data
+            List of market dictionaries with metadata
         """
+        now = time.monotonic()
+        if self._cache is not None and now - self._cache[0] < config.MARKET_LIST_CACHE_SECONDS:
+            return self._cache[1]
+        
+        markets = self._fetch_tradeable_markets()
+        self._cache = (now, markets)
+        return markets
+    
+    def invalidate(self):
+        """Drop the cached market list so the next call refetches from Gamma"""
+        self._cache = None
+    
+    def _fetch_tradeable_markets(self) -> List[Dict[str, Any]]:
+        """Fetch active markets from Gamma and apply the selection criteria"""
         logger.info("Fetching all active markets...")
         
         # Get all active markets from Gamma API
@@ -39,117 +106,142 @@ class MarketSelector:
             "limit": 100
         })
         
-        logger.info(f"Found {len(all_markets)} active markets, filtering...")
+        logger.info("Found %d active markets, filtering...", len(all_markets))
         logger.info("=" * 80)
         
         tradeable_markets = []
         rejected_count = 0
+        # Per-market report lines are skipped entirely when INFO is filtered out
+        log_info = logger.isEnabledFor(logging.INFO)
         
-        logger.info(f"Found {len(all_markets)} active markets, filtering...")
-        logger.info("=" * 80)
+        # Numeric fields parsed once, column-wise, instead of float() per use
+        volumes = _float_column(all_markets, 'volume', 0)
+        volumes_24h = _float_column(all_markets, 'volume24hr', 0)
+        spreads = _float_column(all_markets, 'spread', 1.0)
+        best_bids = _float_column(all_markets, 'bestBid', 0)
+        best_asks = _float_column(all_markets, 'bestAsk', 0)
+        # Cheapest gates for every market at once; only survivors need an end-date parse
+        cheap_ok = ((volumes >= config.MIN_TOTAL_VOLUME)
+                    & (volumes_24h >= config.MIN_24H_VOLUME)
+                    & (spreads <= config.MAX_BID_ASK_SPREAD_PCT))
         
-        tradeable_markets = []
-        rejected_count = 0
+        # One clock reading for the whole cycle (local for date-only end dates)
+        now_local = datetime.now()
+        now_utc = datetime.now(timezone.utc)
         
-        for market in all_markets:
-            market_id = market.get('conditionId', 'unknown')
-            question = market.get('question', 'Unknown')[:60]
-            
-            # Get market metadata for logging
-            volume = float(market.get('volume', 0))
-            volume_24h = float(market.get('volume24hr', 0))
+        for i, market in enumerate(all_markets):
+            volume = volumes[i]
+            volume_24h = volumes_24h[i]
+            spread = spreads[i]
+            # The report shows the resolution time even for cheap rejections
+            if cheap_ok[i] or log_info:
+                hours_result = self._get_hours_to_resolution(market, now_local, now_utc)
+            else:
+                hours_result = _NOT_GIVEN
             
             # Check criteria with detailed logging
             rejection_reasons = []
             
-            if self._meets_criteria(market, rejection_reasons):
-                # Check spread using market data (already calculated by Polymarket)
-                spread = float(market.get('spread', 1.0))
-                best_bid = float(market.get('bestBid', 0))
-                best_ask = float(market.get('bestAsk', 0))
-                
-                # Market spread is already calculated correctly
-                # Accept if spread <= threshold
-                spread_ok = spread <= config.MAX_BID_ASK_SPREAD_PCT
-                
-                if not spread_ok:
-                    rejected_count += 1
-                    hours_result = self._get_hours_to_resolution(market)
-                    hours_remaining = hours_result['hours'] if hours_result else 0
-                    resolution_timestamp = hours_result['timestamp'] if hours_result else 'Unknown'
-                    rejection_reasons.append(f"spread too wide: {spread:.2%}")
-                    
-                    logger.info(f"❌ REJECTED: {question}...")
-                    logger.info(f"   Market ID: {market_id}")
-                    logger.info(f"   Total Volume: ${volume:,.0f}")
-                    logger.info(f"   24h Volume: ${volume_24h:,.0f}")
-                    logger.info(f"   Resolution: {resolution_timestamp} ({hours_remaining:.1f} hours)")
-                    logger.info(f"   Best Bid: {best_bid:.4f}, Best Ask: {best_ask:.4f}, Spread: {spread:.2%}")
-                    logger.info(f"   Reason: {', '.join(rejection_reasons)}")
-                    continue
-                
+            if self._meets_criteria(market, rejection_reasons, volume, volume_24h, hours_result, spread):
                 # Market passed all checks!
                 tradeable_markets.append(market)
+                # Parsed once here so entries don't re-parse the ISO string
+                market['_end_date'] = hours_result['end_date']
                 
                 # Log eligible market
-                hours_result = self._get_hours_to_resolution(market)
-                hours_remaining = hours_result['hours'] if hours_result else 0
-                resolution_timestamp = hours_result['timestamp'] if hours_result else 'Unknown'
-                logger.info(f"✅ ELIGIBLE: {question}...")
-                logger.info(f"   Market ID: {market_id}")
-                logger.info(f"   Total Volume: ${volume:,.0f}")
-                logger.info(f"   24h Volume: ${volume_24h:,.0f}")
-                logger.info(f"   Resolution: {resolution_timestamp} ({hours_remaining:.1f} hours, {hours_remaining/24:.1f} days)")
-                logger.info(f"   Best Bid: {best_bid:.4f}, Best Ask: {best_ask:.4f}, Spread: {spread:.2%}")
-                logger.info(f"   Status: PASS ✓")
+                if log_info:
+                    self._log_market("✅ ELIGIBLE", market, volume, volume_24h, hours_result,
+                                     prices=(best_bids[i], best_asks[i], spread))
             else:
                 rejected_count += 1
-                hours_result = self._get_hours_to_resolution(market)
-                hours_remaining = hours_result['hours'] if hours_result else 0
-                resolution_timestamp = hours_result['timestamp'] if hours_result else 'Unknown'
-                logger.info(f"❌ REJECTED: {question}...")
-                logger.info(f"   Market ID: {market_id}")
-                logger.info(f"   Total Volume: ${volume:,.0f}")
-                logger.info(f"   24h Volume: ${volume_24h:,.0f}")
-                logger.info(f"   Resolution: {resolution_timestamp} ({hours_remaining:.1f} hours)")
-                logger.info(f"   Reason: {', '.join(rejection_reasons)}")
+                if log_info:
+                    self._log_market("❌ REJECTED", market, volume, volume_24h, hours_result,
+                                     reasons=rejection_reasons,
+                                     prices=(best_bids[i], best_asks[i], spread))
         
         logger.info("=" * 80)
-        logger.info(f"✓ {len(tradeable_markets)} markets ELIGIBLE, {rejected_count} REJECTED")
+        logger.info("✓ %d markets ELIGIBLE, %d REJECTED", len(tradeable_markets), rejected_count)
         return tradeable_markets
     
-    def _meets_criteria(self, market: Dict[str, Any], rejection_reasons: List[str]) -> bool:
+    def _log_market(
+        self,
+        verdict: str,
+        market: Dict[str, Any],
+        volume: float,
+        volume_24h: float,
+        hours_result: Optional[dict],
+        reasons: Optional[List[str]] = None,
+        prices: Optional[tuple] = None
+    ):
+        """Log the per-market selection report (callers gate on INFO first)"""
+        hours_remaining = hours_result['hours'] if hours_result else 0
+        resolution_timestamp = hours_result['timestamp'] if hours_result else 'Unknown'
+        
+        logger.info(f"{verdict}: {market.get('question', 'Unknown')[:60]}...")
+        logger.info(f"   Market ID: {market.get('conditionId', 'unknown')}")
+        logger.info(f"   Total Volume: ${volume:,.0f}")
+        logger.info(f"   24h Volume: ${volume_24h:,.0f}")
+        if reasons is None:
+            logger.info(f"   Resolution: {resolution_timestamp} ({hours_remaining:.1f} hours, {hours_remaining/24:.1f} days)")
+        else:
+            logger.info(f"   Resolution: {resolution_timestamp} ({hours_remaining:.1f} hours)")
+        if prices is not None:
+            best_bid, best_ask, spread = prices
+            logger.info(f"   Best Bid: {best_bid:.4f}, Best Ask: {best_ask:.4f}, Spread: {spread:.2%}")
+        if reasons is None:
+            logger.info("   Status: PASS ✓")
+        else:
+            logger.info(f"   Reason: {', '.join(reasons)}")
+    
+    def _meets_criteria(
+        self,
+        market: Dict[str, Any],
+        rejection_reasons: List[str],
+        volume: Optional[float] = None,
+        volume_24h: Optional[float] = None,
+        hours_result: Optional[dict] = _NOT_GIVEN,
+        spread: Optional[float] = None
+    ) -> bool:
         """
         Check if market meets all selection criteria
         
+        Checks run cheapest first and stop at the first failure: plain
+        floats (volume, 24h volume, spread), then the end-date parse, the
+        keyword scan and finally the outcomes decode.
+        
         Args:
             market: Market metadata dictionary
             rejection_reasons: List to populate with rejection reasons
+            volume, volume_24h, hours_result, spread: Values already parsed
+                by the caller; read from the market when omitted
             
         Returns:
             True if market meets all criteria
         """
-        # Check if binary Yes/No market
-        if config.BINARY_ONLY:
-            outcomes = market.get('outcomes', [])
-            if not self._is_binary_market(outcomes):
-                rejection_reasons.append("not binary Yes/No")
-                return False
-        
         # Check total volume
-        volume = float(market.get('volume', 0))
+        if volume is None:
+            volume = float(market.get('volume', 0))
         if volume < config.MIN_TOTAL_VOLUME:
             rejection_reasons.append(f"low volume: ${volume:,.0f} < ${config.MIN_TOTAL_VOLUME:,.0f}")
             return False
         
         # Check 24h volume
-        volume_24h = float(market.get('volume24hr', 0))
+        if volume_24h is None:
+            volume_24h = float(market.get('volume24hr', 0))
         if volume_24h < config.MIN_24H_VOLUME:
             rejection_reasons.append(f"low 24h volume: ${volume_24h:,.0f} < ${config.MIN_24H_VOLUME:,.0f}")
             return False
         
+        # Check spread (already calculated by Polymarket; missing -> NaN -> rejected)
+        if spread is None:
+            spread = float(market.get('spread', 1.0))
+        if not spread <= config.MAX_BID_ASK_SPREAD_PCT:
+            rejection_reasons.append(f"spread too wide: {spread:.2%}")
+            return False
+        
         # Check hours to resolution (use precise UTC timestamp comparison)
-        hours_result = self._get_hours_to_resolution(market)
+        if hours_result is _NOT_GIVEN:
+            hours_result = self._get_hours_to_resolution(market)
         if hours_result is None:
             rejection_reasons.append("no end date")
             return False
@@ -160,12 +252,23 @@ class MarketSelector:
             return False
         
         # Check for excluded keywords (breaking news, fast-moving)
-        question = market.get('question', '').lower()
-        description = market.get('description', '').lower()
+        match = (config.EXCLUDED_RE.search(market.get('question', ''))
+                 or config.EXCLUDED_RE.search(market.get('description', '')))
+        if match:
+            rejection_reasons.append(f"excluded keyword: '{match.group(1).lower()}'")
+            return False
         
-        for keyword in config.EXCLUDED_KEYWORDS:
-            if keyword.lower() in question or keyword.lower() in description:
-                rejection_reasons.append(f"excluded keyword: '{keyword}'")
+        # Check if binary Yes/No market
+        if config.BINARY_ONLY:
+            outcomes = market.get('outcomes', [])
+            if isinstance(outcomes, str):
+                # Gamma sends outcomes as a JSON string; keep the decoded list
+                try:
+                    outcomes = market['outcomes'] = orjson.loads(outcomes)
+                except orjson.JSONDecodeError:
+                    pass  # Left as-is; _is_binary_market rejects it
+            if not self._is_binary_market(outcomes):
+                rejection_reasons.append("not binary Yes/No")
                 return False
         
         return True
@@ -174,10 +277,9 @@ class MarketSelector:
         """Check if market is binary Yes/No"""
         # Handle outcomes as JSON string
         if isinstance(outcomes, str):
-            import json
             try:
-                outcomes = json.loads(outcomes)
-            except:
+                outcomes = orjson.loads(outcomes)
+            except orjson.JSONDecodeError:
                 return False
         
         if len(outcomes) != 2:
@@ -223,29 +325,14 @@ class MarketSelector:
                 }
             
             # Get best prices (bids/asks are OrderSummary objects)
-            def get_price(order):
-                if isinstance(order, dict):
-                    return float(order.get('price', 0))
-                return float(order.price) if hasattr(order, 'price') else 0
+            yes_best_bid = _order_price(yes_bids[0])
+            yes_best_ask = _order_price(yes_asks[0])
+            no_best_bid = _order_price(no_bids[0])
+            no_best_ask = _order_price(no_asks[0])
             
-            yes_best_bid = get_price(yes_bids[0])
-            yes_best_ask = get_price(yes_asks[0])
-            no_best_bid = get_price(no_bids[0])
-            no_best_ask = get_price(no_asks[0])
-            
-            # Calculate spread for each side using midpoint formula:
-            # spread = (ask - bid) / ((ask + bid) / 2)
-            # This gives percentage spread relative to midpoint
-            def calc_spread(bid, ask):
-                if bid <= 0 or ask <= 0:
-                    return 1.0
-                midpoint = (ask + bid) / 2.0
-                if midpoint == 0:
-                    return 1.0
-                return (ask - bid) / midpoint
-            
-            yes_spread = calc_spread(yes_best_bid, yes_best_ask)
-            no_spread = calc_spread(no_best_bid, no_best_ask)
+            # Percentage spread for each side, relative to its midpoint
+            yes_spread = _relative_spread(yes_best_bid, yes_best_ask)
+            no_spread = _relative_spread(no_best_bid, no_best_ask)
             
             # Market is acceptable if at least one side has good spread
             # Reject ONLY if BOTH spreads exceed threshold
@@ -274,15 +361,23 @@ class MarketSelector:
                 'no_ask': 0.0
             }
     
-    def _get_hours_to_resolution(self, market: Dict[str, Any]):
+    def _get_hours_to_resolution(
+        self,
+        market: Dict[str, Any],
+        now_local: Optional[datetime] = None,
+        now_utc: Optional[datetime] = None
+    ):
         """
         Get hours remaining until market resolution using precise UTC timestamps
         
         Args:
             market: Market metadata dictionary
+            now_local, now_utc: Current naive local / aware UTC time, so a
+                selection cycle reads the clock once; read here when omitted
             
         Returns:
-            Dict with 'hours' and 'timestamp', or None if cannot be determined
+            Dict with 'hours', 'timestamp' and parsed 'end_date', or None if
+            cannot be determined
         """
         end_date_str = market.get('endDateIso') or market.get('endDate')
         
@@ -291,16 +386,20 @@ class MarketSelector:
         
         try:
             # Parse ISO format datetime to UTC
-            end_date = datetime.fromisoformat(end_date_str.replace('Z', '+00:00'))
-            now_utc = datetime.now(end_date.tzinfo)
+            end_date = _parse_end_date(end_date_str)
+            if end_date.tzinfo is None:
+                now = now_local if now_local is not None else datetime.now()
+            else:
+                now = now_utc if now_utc is not None else datetime.now(end_date.tzinfo)
             
             # Calculate precise hours remaining
-            time_delta = end_date - now_utc
+            time_delta = end_date - now
             hours_remaining = time_delta.total_seconds() / 3600.0
             
             return {
                 'hours': hours_remaining,
-                'timestamp': end_date_str
+                'timestamp': end_date_str,
+                'end_date': end_date
             }
             
         except Exception as e:
@@ -27,6 +27,7 @@ class PositionManager:
     def __init__(self):
         self.positions: Dict[str, Dict[str, Any]] = {}  # market_id -> position
         self.closed_positions: List[Dict[str, Any]] = []
+        self._deployed = 0.0  # Running sum of open position sizes
         
     def can_open_position(self, bankroll: float) -> Tuple[bool, str]:
         """
@@ -43,8 +44,8 @@ class PositionManager:
             (can_open, reason) tuple
         """
         # Check max concurrent positions
-        open_count = len([p for p in self.positions.values() 
-                         if p['status'] in [PositionStatus.OPEN, PositionStatus.OPENING]])
+        open_count = sum(1 for p in self.positions.values()
+                         if p['status'] in (PositionStatus.OPEN, PositionStatus.OPENING))
         
         if open_count >= config.MAX_CONCURRENT_POSITIONS:
             return False, f"Max concurrent positions reached: {open_count}/{config.MAX_CONCURRENT_POSITIONS}"
@@ -97,7 +98,8 @@ class PositionManager:
         target_price: float,
         stop_price: float,
         position_size: float,
-        market_end_date: Optional[datetime] = None
+        market_end_date: Optional[datetime] = None,
+        token_ids: Optional[List[str]] = None
     ) -> str:
         """
         Open a new position
@@ -111,6 +113,7 @@ class PositionManager:
             stop_price: Stop loss price
             position_size: Position size in USD
             market_end_date: Market resolution date
+            token_ids: YES/NO CLOB token ids, used to price the open position
             
         Returns:
             Position ID
@@ -129,12 +132,19 @@ class PositionManager:
             'shares': position_size / entry_price,  # Convert USD to shares
             'entry_time': datetime.now(),
             'market_end_date': market_end_date,
+            'token_ids': token_ids or [],
             'status': PositionStatus.OPEN,
             'fill_price': entry_price,  # Assume full fill at entry price initially
-            'partial_fills': []
+            'partial_fills': [],
+            # Running partial-fill totals (USD filled, sum of size * price)
+            '_total_filled': 0.0,
+            '_notional': 0.0
         }
         
+        if market_id in self.positions:
+            self._deployed -= self.positions[market_id]['position_size']
         self.positions[market_id] = position
+        self._deployed += position_size
         
         logger.info(f"✓ Opened position: {market_question[:50]}... "
                    f"({signal.value} @ {entry_price:.3f}, size: ${position_size:.2f})")
@@ -180,6 +190,8 @@ class PositionManager:
         # Move to closed positions
         self.closed_positions.append(position)
         del self.positions[market_id]
+        # Snap back to zero when flat so float error can't accumulate
+        self._deployed = self._deployed - entry_value if self.positions else 0.0
         
         logger.info(f"✓ Closed position: {position['market_question'][:50]}... "
                    f"(P&L: ${pnl:+.2f} / {pnl_pct:+.1f}%, Reason: {reason})")
@@ -200,7 +212,7 @@ class PositionManager:
     
     def get_deployed_capital(self) -> float:
         """Calculate total capital currently deployed"""
-        return sum(p['position_size'] for p in self.positions.values())
+        return self._deployed
     
     def get_closed_positions_today(self) -> List[Dict[str, Any]]:
         """Get positions closed today"""
@@ -234,11 +246,14 @@ class PositionManager:
             'time': datetime.now()
         }
         
-        position['partial_fills'].append(fill_data)
+        position['partial_fills'].append(fill_data)  # Audit trail only
         
-        # Recalculate average fill price
-        total_filled = sum(f['size'] for f in position['partial_fills'])
-        weighted_price = sum(f['size'] * f['price'] for f in position['partial_fills']) / total_filled
+        # Update the average fill price from running totals
+        total_filled = position['_total_filled'] + filled_size
+        notional = position['_notional'] + filled_size * fill_price
+        position['_total_filled'] = total_filled
+        position['_notional'] = notional
+        weighted_price = notional / total_filled
         
         position['fill_price'] = weighted_price
         position['shares'] = total_filled / weighted_price
@@ -0,0 +1,50 @@
+"""
+Shared Coinbase REST client
+One pooled, keep-alive HTTP session reused by every Coinbase script
+"""
+
+import os
+from dotenv import load_dotenv
+from coinbase.rest import RESTClient
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+load_dotenv()
+
+API_KEY = os.getenv('CLIENT_API_KEY')
+API_SECRET = os.getenv('CLIENT_API_SECRET')
+
+# Connection pool / retry settings
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 8
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF_FACTOR = 1
+
+_client = None
+
+
+def _make_session():
+    """Session with a keep-alive connection pool; only idempotent requests are retried"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=Retry(total=RETRY_ATTEMPTS, backoff_factor=RETRY_BACKOFF_FACTOR),
+    )
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+def get_client():
+    """Return the process-wide RESTClient, creating it on first use"""
+    global _client
+    if _client is None:
+        _client = RESTClient(api_key=API_KEY, api_secret=API_SECRET)
+        # The SDK sends every call through `client.session`; swapping in a
+        # pooled session saves a TLS handshake per request after the first.
+        if isinstance(getattr(_client, 'session', None), requests.Session):
+            _client.session.close()
+            _client.session = _make_session()
+    return _client
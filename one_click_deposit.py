@@ -5,7 +5,7 @@ Automatically buys USDC and transfers to your trading wallet
 
 import os
 from dotenv import load_dotenv
-from coinbase.rest import RESTClient
+from coinbase_client import get_client
 from eth_account import Account
 import time
 import sys
@@ -21,7 +21,7 @@ WALLET_ADDRESS = wallet.address
 
 # Initialize client
 try:
-    client = RESTClient(api_key=API_KEY, api_secret=API_SECRET)
+    client = get_client()
 except Exception as e:
     print(f"❌ Failed to initialize Coinbase client: {e}")
     sys.exit(1)
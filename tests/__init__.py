@@ -0,0 +1,33 @@
+"""
+Test package setup.
+
+agents.trading imports improved_trader, which pulls in connectors that call
+Tavily at import time and need web3/newsapi. Register lightweight stand-ins
+for those modules so the unit tests import offline.
+"""
+
+import sys
+import types
+
+
+def _stub_module(name: str, **attrs) -> None:
+    if name in sys.modules:
+        return
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+
+
+class _Unavailable:
+    """Placeholder for a connector that is not available under test"""
+
+    def __init__(self, *args, **kwargs):
+        raise RuntimeError(f"{type(self).__name__} is not available in tests")
+
+
+_stub_module("agents.connectors.search", tavily_client=None)
+_stub_module("agents.connectors.news", News=type("News", (_Unavailable,), {}))
+_stub_module(
+    "agents.polymarket.polymarket",
+    Polymarket=type("Polymarket", (_Unavailable,), {}),
+)
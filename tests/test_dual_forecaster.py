@@ -0,0 +1,143 @@
+import json
+import unittest
+
+from agents.application.prompts import Prompter
+from agents.trading.dual_forecaster import DualForecaster
+
+
+def offline_forecaster():
+    # The batch helpers need no API clients, so skip __init__
+    forecaster = object.__new__(DualForecaster)
+    forecaster._encoding = None
+    forecaster._encoding_loaded = True
+    return forecaster
+
+
+def parse(response, count=3):
+    return offline_forecaster()._parse_batch_response(response, count, "Test")
+
+
+class TestParseBatchResponse(unittest.TestCase):
+    def test_routes_forecasts_by_index(self):
+        response = json.dumps(
+            {
+                "forecasts": [
+                    {
+                        "index": 2,
+                        "probability": 30,
+                        "outcome": "no",
+                        "reasoning": "third",
+                    },
+                    {
+                        "index": 0,
+                        "probability": 65,
+                        "outcome": "Yes",
+                        "reasoning": "first",
+                    },
+                    {"index": 1, "probability": "40", "reasoning": "second"},
+                ]
+            }
+        )
+        results = parse(response)
+        self.assertEqual(results[0], (0.65, "Yes", "first"))
+        self.assertEqual(results[1], (0.40, "Yes", "second"))
+        self.assertEqual(results[2], (0.30, "No", "third"))
+
+    def test_missing_entries_stay_empty(self):
+        response = json.dumps(
+            {"forecasts": [{"index": 1, "probability": 55, "outcome": "Yes"}]}
+        )
+        results = parse(response)
+        self.assertEqual(results[1][:2], (0.55, "Yes"))
+        for missing in (results[0], results[2]):
+            self.assertIsNone(missing[0])
+            self.assertIsNone(missing[1])
+            self.assertIn("no forecast returned", missing[2])
+
+    def test_out_of_range_and_malformed_entries_are_skipped(self):
+        response = json.dumps(
+            {
+                "forecasts": [
+                    {"index": 3, "probability": 50},
+                    {"index": -1, "probability": 50},
+                    {"index": "x", "probability": 50},
+                    {"probability": 50},
+                    {"index": 0},
+                    {"index": 0, "probability": "n/a"},
+                    {"index": 1, "probability": None},
+                    "not an object",
+                ]
+            }
+        )
+        self.assertTrue(all(prob is None for prob, _, _ in parse(response)))
+
+    def test_probabilities_are_clamped(self):
+        response = json.dumps(
+            {
+                "forecasts": [
+                    {"index": 0, "probability": 0},
+                    {"index": 1, "probability": 100},
+                    {"index": 2, "probability": 250},
+                ]
+            }
+        )
+        self.assertEqual([prob for prob, _, _ in parse(response)], [0.01, 0.99, 0.99])
+
+    def test_unknown_outcome_defaults_to_yes(self):
+        response = json.dumps(
+            {"forecasts": [{"index": 0, "probability": 20, "outcome": "Maybe"}]}
+        )
+        self.assertEqual(parse(response, 1)[0][1], "Yes")
+
+    def test_reasoning_is_truncated(self):
+        response = json.dumps(
+            {"forecasts": [{"index": 0, "probability": 20, "reasoning": "x" * 600}]}
+        )
+        self.assertEqual(len(parse(response, 1)[0][2]), 500)
+
+    def test_bad_json(self):
+        for response in ("not json", '{"forecasts": [', "[1, 2, 3]", ""):
+            results = parse(response)
+            self.assertEqual(len(results), 3)
+            self.assertTrue(all(prob is None for prob, _, _ in results))
+
+    def test_missing_forecasts_key(self):
+        self.assertTrue(
+            all(prob is None for prob, _, _ in parse(json.dumps({"other": []})))
+        )
+
+
+class TestBuildBatchPrompt(unittest.TestCase):
+    MARKETS = [
+        {
+            "question": "Will it rain?",
+            "description": "Resolves YES on rain.",
+            "outcomes": ["Yes", "No"],
+            "context": "Forecast: showers",
+        },
+        {"question": "Will it snow?"},
+    ]
+
+    def entries(self, prompt):
+        listing = prompt.split("MARKETS:\n", 1)[1].split("\n\nRespond", 1)[0]
+        return json.loads(listing)
+
+    def test_entries_use_prompt_template(self):
+        prompt = offline_forecaster()._build_batch_prompt(
+            self.MARKETS, Prompter().superforecaster
+        )
+        entries = self.entries(prompt)
+        self.assertEqual([e["index"] for e in entries], [0, 1])
+        self.assertIn("Superforecaster", entries[0]["prompt"])
+        self.assertIn("question=`Will it rain?`", entries[0]["prompt"])
+        self.assertIn("Forecast: showers", entries[0]["prompt"])
+        self.assertIn("question=`Will it snow?`", entries[1]["prompt"])
+
+    def test_structured_entries_without_template(self):
+        entries = self.entries(offline_forecaster()._build_batch_prompt(self.MARKETS))
+        self.assertEqual(entries[0]["context"], "Forecast: showers")
+        self.assertEqual(entries[1]["outcomes"], ["Yes", "No"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from agents.trading.api_client import Market
+from agents.trading.filters import (
+    FilterConfig,
+    MarketFilter,
+    get_eoy_config,
+    get_relaxed_config,
+    get_test_config,
+)
+
+
+def make_market(
+    n, volume=200_000, volume_24h=20_000, days=60, prices=(0.40, 0.60), **kwargs
+):
+    end_date = None
+    if days is not None:
+        # An hour of slack so the whole-day count is stable while the test runs
+        end_date = datetime.now(timezone.utc) + timedelta(days=days, hours=1)
+    return Market(
+        id=f"m{n}",
+        question=kwargs.pop("question", f"Will event {n} happen?"),
+        outcomes=["Yes", "No"],
+        outcome_prices=list(prices),
+        volume=volume,
+        volume_24h=volume_24h,
+        end_date=end_date,
+        **kwargs,
+    )
+
+
+def sample_markets():
+    """Markets straddling every FilterConfig threshold, including exact boundaries"""
+    markets = [
+        make_market(0),
+        make_market(1, closed=True),
+        make_market(2, active=False),
+        make_market(3, volume=149_999),
+        make_market(4, volume=150_000),
+        make_market(5, volume=60_000, volume_24h=3_000),
+        make_market(6, volume_24h=9_999),
+        make_market(7, volume_24h=10_000),
+        make_market(8, volume_24h=600),
+        make_market(9, days=None),
+        make_market(10, days=0),
+        make_market(11, days=5),
+        make_market(12, days=29),
+        make_market(13, days=30),
+        make_market(14, days=180),
+        make_market(15, days=181),
+        make_market(16, days=300),
+        make_market(17, prices=(0.90, 0.10)),
+        make_market(18, prices=(0.91, 0.09)),
+        make_market(19, prices=(0.96, 0.04)),
+        make_market(20, prices=(0.05, 0.95)),
+        make_market(21, prices=(0.015, 0.985)),
+        make_market(22, prices=(0.5, 0.3, 0.2)),
+        make_market(23, question="Will Bitcoin hit $200k?", days=10),
+        make_market(24, volume=0, volume_24h=0),
+    ]
+    return markets
+
+
+class TestFilterMarketsVec(unittest.TestCase):
+    def assert_parity(self, config):
+        markets = sample_markets()
+        scalar = MarketFilter(config)
+        vec = MarketFilter(config)
+
+        scalar_passed = scalar.filter_markets(markets)
+        vec_passed = vec.filter_markets_vec(markets)
+
+        self.assertEqual([m.id for m in vec_passed], [m.id for m in scalar_passed])
+        self.assertEqual(vec.get_rejection_counts(), scalar.get_rejection_counts())
+        self.assertEqual(vec.get_rejection_log(), scalar.get_rejection_log())
+        self.assertEqual(vec.get_near_misses(), scalar.get_near_misses())
+
+    def test_parity_strict(self):
+        self.assert_parity(FilterConfig())
+
+    def test_parity_relaxed(self):
+        self.assert_parity(get_relaxed_config())
+
+    def test_parity_eoy(self):
+        self.assert_parity(get_eoy_config())
+
+    def test_parity_test_config(self):
+        self.assert_parity(get_test_config())
+
+    def test_boundaries_pass(self):
+        passed = {
+            m.id
+            for m in MarketFilter(FilterConfig()).filter_markets_vec(sample_markets())
+        }
+        self.assertTrue({"m0", "m4", "m7", "m13", "m14", "m17", "m22"} <= passed)
+        self.assertFalse(
+            {"m1", "m2", "m3", "m6", "m9", "m12", "m15", "m18", "m21"} & passed
+        )
+
+    def test_empty_input(self):
+        market_filter = MarketFilter()
+        self.assertEqual(market_filter.filter_markets_vec([]), [])
+        self.assertEqual(market_filter.get_near_misses(), [])
+
+    def test_record_rejections_off(self):
+        market_filter = MarketFilter()
+        passed = market_filter.filter_markets_vec(
+            sample_markets(), record_rejections=False
+        )
+        self.assertEqual(
+            [m.id for m in passed],
+            [m.id for m in MarketFilter().filter_markets(sample_markets())],
+        )
+        self.assertEqual(market_filter.get_rejection_log(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+
+from automated_trader.position_manager import PositionManager
+from automated_trader.signal_generator import Signal
+
+
+def open_position(manager, market_id="m1", entry_price=0.50, position_size=10.0):
+    return manager.open_position(
+        market_id=market_id,
+        market_question="Will the test pass?",
+        signal=Signal.BUY_YES,
+        entry_price=entry_price,
+        target_price=entry_price + 0.1,
+        stop_price=entry_price - 0.1,
+        position_size=position_size,
+    )
+
+
+class TestPartialFills(unittest.TestCase):
+    def test_running_average_matches_fill_history(self):
+        manager = PositionManager()
+        open_position(manager)
+        fills = [(4.0, 0.50), (2.5, 0.52), (3.5, 0.47), (0.25, 0.60)]
+
+        for size, price in fills:
+            manager.handle_partial_fill("m1", size, price)
+
+            # Recompute from the audit trail and compare with the O(1) update
+            history = manager.get_position("m1")["partial_fills"]
+            total = sum(f["size"] for f in history)
+            average = sum(f["size"] * f["price"] for f in history) / total
+
+            position = manager.get_position("m1")
+            self.assertAlmostEqual(position["fill_price"], average)
+            self.assertAlmostEqual(position["shares"], total / average)
+
+        self.assertEqual(len(manager.get_position("m1")["partial_fills"]), len(fills))
+
+    def test_single_fill_sets_price(self):
+        manager = PositionManager()
+        open_position(manager)
+        manager.handle_partial_fill("m1", 5.0, 0.55)
+
+        position = manager.get_position("m1")
+        self.assertAlmostEqual(position["fill_price"], 0.55)
+        self.assertAlmostEqual(position["shares"], 5.0 / 0.55)
+
+    def test_fill_for_unknown_position_is_ignored(self):
+        manager = PositionManager()
+        manager.handle_partial_fill("missing", 5.0, 0.55)
+        self.assertIsNone(manager.get_position("missing"))
+
+    def test_running_totals_are_per_position(self):
+        manager = PositionManager()
+        open_position(manager, "m1")
+        open_position(manager, "m2")
+        manager.handle_partial_fill("m1", 4.0, 0.40)
+        manager.handle_partial_fill("m2", 1.0, 0.70)
+        manager.handle_partial_fill("m1", 4.0, 0.60)
+
+        self.assertAlmostEqual(manager.get_position("m1")["fill_price"], 0.50)
+        self.assertAlmostEqual(manager.get_position("m2")["fill_price"], 0.70)
+
+
+class TestDeployedCapital(unittest.TestCase):
+    def test_tracks_open_and_close(self):
+        manager = PositionManager()
+        self.assertEqual(manager.get_deployed_capital(), 0.0)
+
+        open_position(manager, "m1", position_size=10.0)
+        open_position(manager, "m2", position_size=5.5)
+        self.assertAlmostEqual(manager.get_deployed_capital(), 15.5)
+
+        manager.close_position("m1", 0.55, "target")
+        self.assertAlmostEqual(manager.get_deployed_capital(), 5.5)
+
+        manager.close_position("m2", 0.45, "stop")
+        self.assertEqual(manager.get_deployed_capital(), 0.0)
+
+    def test_reopening_same_market_replaces_size(self):
+        manager = PositionManager()
+        open_position(manager, "m1", position_size=10.0)
+        open_position(manager, "m1", position_size=4.0)
+        self.assertAlmostEqual(manager.get_deployed_capital(), 4.0)
+
+
+class TestTokenIds(unittest.TestCase):
+    def test_token_ids_are_stored(self):
+        manager = PositionManager()
+        manager.open_position(
+            market_id="m1",
+            market_question="Will the test pass?",
+            signal=Signal.BUY_NO,
+            entry_price=0.5,
+            target_price=0.6,
+            stop_price=0.4,
+            position_size=10.0,
+            token_ids=["yes-token", "no-token"],
+        )
+        open_position(manager, "m2")
+
+        self.assertEqual(
+            manager.get_position("m1")["token_ids"], ["yes-token", "no-token"]
+        )
+        self.assertEqual(manager.get_position("m2")["token_ids"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
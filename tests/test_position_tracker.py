@@ -0,0 +1,159 @@
+import json
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from agents.trading.improved_trader import MAX_CONCURRENT_POSITIONS, PositionTracker
+
+LEGACY_POSITIONS = {
+    "positions": [
+        {
+            "market_id": "m1",
+            "question": "Will it rain?",
+            "action": "BUY_YES",
+            "amount": 1.5,
+            "timestamp": "2025-12-01T10:00:00",
+        },
+        {
+            "market_id": "m2",
+            "question": "Will it snow?",
+            "action": "BUY_NO",
+            "amount": 2.0,
+            "timestamp": "2025-12-02T10:00:00",
+        },
+    ]
+}
+
+
+class TestPositionTracker(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.db_path = self.tmpdir / "positions.db"
+        self.legacy_path = self.tmpdir / "positions.json"
+        self.trackers = []
+
+    def tearDown(self):
+        for tracker in self.trackers:
+            tracker.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def open_tracker(self) -> PositionTracker:
+        tracker = PositionTracker(str(self.db_path), str(self.legacy_path))
+        self.trackers.append(tracker)
+        return tracker
+
+    def stored_count(self) -> int:
+        conn = sqlite3.connect(str(self.db_path))
+        try:
+            return conn.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_starts_empty_without_legacy_file(self):
+        tracker = self.open_tracker()
+        self.assertEqual(tracker.get_count(), 0)
+        self.assertTrue(tracker.can_add_position())
+
+    def test_legacy_json_imported_once(self):
+        self.legacy_path.write_text(json.dumps(LEGACY_POSITIONS))
+
+        first = self.open_tracker()
+        self.assertEqual(first.get_count(), 2)
+        first.close()
+        self.trackers.remove(first)
+
+        # The legacy file is still there, but the database already has rows
+        second = self.open_tracker()
+        self.assertEqual(second.get_count(), 2)
+        self.assertEqual(self.stored_count(), 2)
+
+        rows = second.conn.execute(
+            "SELECT market_id, question, action, amount, timestamp FROM positions ORDER BY id"
+        ).fetchall()
+        self.assertEqual(
+            rows[0], ("m1", "Will it rain?", "BUY_YES", 1.5, "2025-12-01T10:00:00")
+        )
+        self.assertEqual(rows[1][0], "m2")
+
+    def test_unreadable_legacy_file_is_ignored(self):
+        self.legacy_path.write_text("{not json")
+        tracker = self.open_tracker()
+        self.assertEqual(tracker.get_count(), 0)
+
+    def test_non_object_legacy_file_is_ignored(self):
+        self.legacy_path.write_text("[1, 2, 3]")
+        tracker = self.open_tracker()
+        self.assertEqual(tracker.get_count(), 0)
+
+    def test_legacy_count_field_is_honoured(self):
+        legacy = dict(LEGACY_POSITIONS, count=MAX_CONCURRENT_POSITIONS)
+        self.legacy_path.write_text(json.dumps(legacy))
+
+        tracker = self.open_tracker()
+        self.assertEqual(self.stored_count(), 2)
+        self.assertEqual(tracker.get_count(), MAX_CONCURRENT_POSITIONS)
+        self.assertFalse(tracker.can_add_position())
+        tracker.close()
+        self.trackers.remove(tracker)
+
+        self.assertEqual(self.open_tracker().get_count(), MAX_CONCURRENT_POSITIONS)
+
+    def test_legacy_count_reset_frees_slots(self):
+        self.legacy_path.write_text(json.dumps(dict(LEGACY_POSITIONS, count=0)))
+        tracker = self.open_tracker()
+        self.assertEqual(tracker.get_count(), 0)
+        tracker.add_position("m3", "Question?", "BUY_YES", 1.0)
+        self.assertEqual(tracker.get_count(), 1)
+
+    def test_count_survives_reopen(self):
+        tracker = self.open_tracker()
+        tracker.add_position("m1", "Question one?", "BUY_YES", 1.0)
+        tracker.add_position("m2", "Question two?" * 10, "BUY_NO", 2.0)
+        self.assertEqual(tracker.get_count(), 2)
+        tracker.close()
+        self.trackers.remove(tracker)
+
+        reopened = self.open_tracker()
+        self.assertEqual(reopened.get_count(), 2)
+        question = reopened.conn.execute(
+            "SELECT question FROM positions WHERE market_id = 'm2'"
+        ).fetchone()[0]
+        self.assertEqual(len(question), 50)
+
+    def test_inserts_are_buffered_until_flush(self):
+        tracker = self.open_tracker()
+        tracker.add_position("m1", "Question one?", "BUY_YES", 1.0)
+        self.assertEqual(tracker.get_count(), 1)
+        self.assertEqual(self.stored_count(), 0)
+
+        tracker.flush()
+        self.assertEqual(self.stored_count(), 1)
+
+    def test_position_limit(self):
+        tracker = self.open_tracker()
+        for i in range(MAX_CONCURRENT_POSITIONS):
+            self.assertTrue(tracker.can_add_position())
+            tracker.add_position(f"m{i}", "Question?", "BUY_YES", 1.0)
+        self.assertFalse(tracker.can_add_position())
+        tracker.close()
+        self.trackers.remove(tracker)
+
+        self.assertFalse(self.open_tracker().can_add_position())
+
+    def test_close_commits_buffered_inserts(self):
+        tracker = self.open_tracker()
+        tracker.add_position("m1", "Question one?", "BUY_YES", 1.0)
+        tracker.close()
+        self.trackers.remove(tracker)
+        self.assertEqual(self.stored_count(), 1)
+
+    def test_uses_wal_journal(self):
+        tracker = self.open_tracker()
+        mode = tracker.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode.lower(), "wal")
+
+
+if __name__ == "__main__":
+    unittest.main()